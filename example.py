@@ -84,9 +84,11 @@ result = dispatch(
     verbose=True
 )
 
+# Save trace to disk in the background while we print the tree
+saver, path = result["trace"].save_async()
+
 print("\n📜 Full Trace Tree:")
 result["trace"].pretty_print()
 
-# Save trace to disk
-path = result["trace"].save()
+saver.join()
 print(f"\n💾 Trace saved to: {path}")
\ No newline at end of file
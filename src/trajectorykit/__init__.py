@@ -1,9 +1,42 @@
 """
 TrajectoryKit: An agentic system with tool calling capabilities powered by vLLM.
+
+The public names are imported lazily (PEP 562): importing this package
+used to eagerly pull in the whole agent stack — config (which reads the
+YAML and prompt files from disk), the tool store, and the HTML trace
+renderer — even for callers that only wanted one symbol. Attribute
+access triggers the real import once and caches it in the module
+globals, so ``import trajectorykit`` is now near-free.
 """
 
-from .agent import dispatch
-from .tracing import EpisodeTrace, render_trace_html, render_trace_file
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .agent import dispatch
+    from .live_trace import LiveTraceServer
+    from .tracing import EpisodeTrace, render_trace_html, render_trace_file
 
-__all__ = ["dispatch", "EpisodeTrace", "render_trace_html", "render_trace_file"]
+__all__ = ["dispatch", "EpisodeTrace", "LiveTraceServer", "render_trace_html", "render_trace_file"]
 __version__ = "0.2.0"
+
+_LAZY_ATTRS = {
+    "dispatch": ".agent",
+    "EpisodeTrace": ".tracing",
+    "LiveTraceServer": ".live_trace",
+    "render_trace_html": ".tracing",
+    "render_trace_file": ".tracing",
+}
+
+
+def __getattr__(name: str):
+    target = _LAZY_ATTRS.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(target, __name__), name)
+    globals()[name] = value  # cache: next access skips __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
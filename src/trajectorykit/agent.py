@@ -37,6 +37,7 @@ def dispatch(
     _depth: int = 0,
     _sandbox_files: Optional[Dict[str, str]] = None,
     _is_synthesizer: bool = False,
+    _context: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Run an agentic loop with iterative tool calling and response refinement.
@@ -61,6 +62,12 @@ def dispatch(
         _is_synthesizer: If True, use the synthesizer prompt and restricted tool set.
                          Decoupled from _sandbox_files so regular workers can also
                          receive sandbox files (e.g. via memory_keys on spawn_agent).
+        _context: Shared context blob injected as its own user message before the
+                  task (internal — used by spawn_agent). Keeping it separate from
+                  user_input means sibling sub-agents forked with the same context
+                  present an identical token prefix to vLLM, so its automatic
+                  prefix cache serves the system prompt + context for every fork
+                  and only the short task string is prefilled fresh.
 
     Returns:
         Dictionary with:
@@ -88,6 +95,7 @@ def dispatch(
         _depth=_depth,
         _sandbox_files=_sandbox_files,
         _is_synthesizer=_is_synthesizer,
+        _context=_context,
     )
 
     # ── Pre-dispatch chain analysis (root only) ──────────────────────
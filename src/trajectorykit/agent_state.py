@@ -9,10 +9,11 @@ and mutate this state.
 from __future__ import annotations
 
 import os
+import sys
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple  # Dict used for draft_feedback
+from typing import Any, Dict, List, Optional, Tuple, TypedDict  # Dict used for draft_feedback
 
 from . import config as _cfg
 from .config import get_model_profile
@@ -23,6 +24,32 @@ from .tool_store import TOOLS, ROOT_TOOLS
 from .tracing import EpisodeTrace, TurnRecord, ToolCallRecord
 
 
+# ── Interned role constants ───────────────────────────────────────────
+# Shared by every message constructor so each role is one str object
+# across hundreds of history rows — equality/hash checks become pointer
+# comparisons and the per-turn serialization walk touches fewer objects.
+ROLE_SYSTEM = sys.intern("system")
+ROLE_USER = sys.intern("user")
+ROLE_ASSISTANT = sys.intern("assistant")
+ROLE_TOOL = sys.intern("tool")
+
+
+class Message(TypedDict, total=False):
+    """One chat message row in the conversation history.
+
+    total=False because tool_calls only appears on assistant messages
+    and tool_call_id only on tool messages.  Keeping rows to exactly
+    these keys (see the sanitize step in the runner) keeps the per-turn
+    payload lean — the raw API message carries extras like
+    reasoning_content and null tool_calls that would otherwise be
+    re-serialized on every subsequent turn.
+    """
+    role: str
+    content: str
+    tool_calls: List[dict]
+    tool_call_id: str
+
+
 @dataclass
 class AgentState:
     """Complete typed state for a single dispatch() execution.
@@ -50,7 +77,7 @@ class AgentState:
     context_window: int
 
     # ── Messages ──────────────────────────────────────────────────────
-    messages: List[dict]
+    messages: List[Message]
 
     # ── Tool configuration ────────────────────────────────────────────
     system_prompt: str
@@ -65,11 +92,14 @@ class AgentState:
     # ── Turn tracking ─────────────────────────────────────────────────
     turn: int = 0
     total_tool_calls: int = 0
+    # Most recent non-empty assistant content, tracked inline by the
+    # turn loop so turn-limit fallbacks don't reverse-scan the history.
+    last_assistant_content: str = ""
 
     # ── Error tracking ────────────────────────────────────────────────
     consecutive_error_count: int = 0
     consecutive_no_tool_count: int = 0
-    last_error_signature: Optional[str] = None
+    last_error_signature: Optional[int] = None  # hash((tool_name, error head))
 
     # ── Research tracking ─────────────────────────────────────────────
     findings: List[str] = field(default_factory=list)
@@ -100,9 +130,27 @@ class AgentState:
     # ── Degeneration flag ─────────────────────────────────────────────
     degenerated: bool = False
 
+    # ── Concurrent tool-call prefetch (runner._prefetch_tool_outputs) ─
+    # tool_call_id → (output, child_trace, duration_s), consumed by
+    # handle_generic_tool so handlers keep their original ordering.
+    prefetched_tool_results: Dict[str, Tuple[str, Any, float]] = field(default_factory=dict)
+    # Futures for calls launched while the response was still streaming
+    # (runner._early_prefetch_hook); drained by _prefetch_tool_outputs.
+    prefetch_futures: Dict[str, Any] = field(default_factory=dict)
+
+    # ── Live trace viewer (root only, agent.live_trace) ───────────────
+    live_server: Optional[Any] = None
+
     # ── History truncation (root only) ────────────────────────────────
     _last_truncation_turn: int = 0
 
+    # ── History compaction ────────────────────────────────────────────
+    # Leading messages pinned through compaction: the system prompt, the
+    # optional shared-context row, and the task.  Recorded at spawn so
+    # _compact_history never evicts a sub-agent's instructions when the
+    # context row shifts the task to index 2.
+    pinned_prefix: int = 2
+
     # ── Constants (configurable per run via config.yaml) ──────────────
     MAX_CONSECUTIVE_ERRORS: int = 3
     MAX_CONSECUTIVE_SEARCHES: int = 6
@@ -111,6 +159,50 @@ class AgentState:
     MAX_SPOT_CHECK_REJECTIONS: int = field(default_factory=lambda: _cfg.MAX_SPOT_CHECK_REJECTIONS)
 
 
+# Pre-filtered tool selections. The filters are static, so computing
+# them per create_state() built a fresh list on every spawn — which also
+# gave each spawn a distinct identity and defeated the runner's
+# pre-serialized tools-bytes cache. One frozen tuple per role instead.
+_SYNTHESIZER_TOOLS = tuple(
+    t for t in TOOLS
+    if t["function"]["name"] in ("execute_code", "final_answer", "search_available_tools")
+)
+_WORKER_TOOLS = tuple(
+    t for t in TOOLS
+    if t["function"]["name"] not in ("spawn_agent", "recall_memory", "update_draft")
+)
+
+
+# Shared system-message rows, keyed by prompt text. The system row is
+# never mutated after construction — the loop only appends after it and
+# history compaction preserves messages[0] untouched — so every dispatch
+# using the same prompt (each recursive sub-agent spawn, notably) can
+# share one dict. Byte-identical system rows also keep vLLM's prefix
+# cache hot across spawns.
+_system_msg_cache: Dict[str, Message] = {}
+
+
+def _system_message(prompt: str) -> Message:
+    msg = _system_msg_cache.get(prompt)
+    if msg is None:
+        msg = {"role": ROLE_SYSTEM, "content": prompt}
+        _system_msg_cache[prompt] = msg
+    return msg
+
+
+# Shared context rows for spawn_agent forks, same rationale and same
+# immutability contract as _system_msg_cache above.
+_shared_context_cache: Dict[str, Message] = {}
+
+
+def _shared_context_message(context: str) -> Message:
+    msg = _shared_context_cache.get(context)
+    if msg is None:
+        msg = {"role": ROLE_USER, "content": f"Shared context from the parent agent:\n\n{context}"}
+        _shared_context_cache[context] = msg
+    return msg
+
+
 def create_state(
     user_input: str,
     turn_length: Optional[int] = 5,
@@ -123,6 +215,7 @@ def create_state(
     _depth: int = 0,
     _sandbox_files: Optional[Dict[str, str]] = None,
     _is_synthesizer: bool = False,
+    _context: Optional[str] = None,
 ) -> AgentState:
     """Initialize an AgentState from dispatch() parameters.
 
@@ -148,6 +241,8 @@ def create_state(
     assert max_tokens is not None
 
     # ── Initialize trace ──────────────────────────────────────────────
+    # Wall clock for the started_at stamp; monotonic reference for the
+    # episode duration computed in the runner's _finalize.
     episode = EpisodeTrace(
         depth=_depth,
         example_id=example_id or "",
@@ -162,24 +257,24 @@ def create_state(
     # ── Depth-aware prompt & tool selection ────────────────────────────
     if _is_synthesizer:
         system_prompt = _cfg.SYNTHESIZER_PROMPT
-        available_tools = [
-            t for t in TOOLS
-            if t["function"]["name"] in ("execute_code", "final_answer", "search_available_tools")
-        ]
+        available_tools = _SYNTHESIZER_TOOLS
     elif _depth == 0:
         system_prompt = _cfg.SYSTEM_PROMPT
         available_tools = ROOT_TOOLS
     else:
         system_prompt = _cfg.WORKER_PROMPT
-        available_tools = [
-            t for t in TOOLS
-            if t["function"]["name"] not in ("spawn_agent", "recall_memory", "update_draft")
-        ]
-
-    messages = [
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": user_input},
-    ]
+        available_tools = _WORKER_TOOLS
+
+    messages: List[Message] = [_system_message(system_prompt)]
+    if _context:
+        # Shared context rides in its own user row so sibling forks with
+        # the same context present an identical token prefix — vLLM's
+        # prefix cache then covers system prompt + context for all of
+        # them and only the task below is prefilled fresh. Like the
+        # system row, the context row is never mutated, so forks share
+        # one dict per distinct context blob.
+        messages.append(_shared_context_message(_context))
+    messages.append({"role": ROLE_USER, "content": user_input})
 
     # ── Terminal tool schema ──────────────────────────────────────────
     terminal_tool_name = "research_complete" if _depth == 0 else "final_answer"
@@ -224,7 +319,8 @@ def create_state(
         terminal_tool_name=terminal_tool_name,
         terminal_tool=terminal_tool,
         episode=episode,
-        episode_start=time.time(),
+        episode_start=time.perf_counter(),
+        pinned_prefix=len(messages),
         draft_path=draft_path,
         plan=plan,
     )
@@ -22,7 +22,8 @@ import re
 from dataclasses import dataclass, field
 from typing import List, Optional
 
-import requests
+from .utils import VLLM_CLIENT, fast_json_loads
+
 
 logger = logging.getLogger(__name__)
 
@@ -298,13 +299,15 @@ def analyze_chain(
     }
 
     try:
-        resp = requests.post(
+        # Pooled keep-alive client shared with the runner and handler
+        # nodes — no per-call TCP setup (see utils.VLLM_CLIENT).
+        resp = VLLM_CLIENT.post(
             f"{vllm_url}/chat/completions",
             json=payload,
             timeout=60,
         )
         if resp.status_code == 200:
-            data = resp.json()
+            data = fast_json_loads(resp.content)
             choices = data.get("choices", [])
             if choices:
                 content = choices[0].get("message", {}).get("content", "")
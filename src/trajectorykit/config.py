@@ -16,7 +16,7 @@ Config resolution order:
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 import yaml
 
@@ -97,13 +97,33 @@ def _resolve_path(relative: str) -> str:
     return str(_REPO_ROOT / relative)
 
 
+# Rendered prompts, keyed by (filepath, extra_vars). Every load_config()
+# call — one per config_path dispatch — re-read and re-rendered each
+# prompt file; the templates only change on disk between runs, so cache
+# the rendered text. The cache is dropped on day rollover so the
+# {current_date} stamp stays correct for long-lived processes.
+_prompt_cache: Dict[tuple, str] = {}
+_prompt_cache_date: str = ""
+
+
 def _load_prompt(filepath: str, **extra_vars) -> str:
     """Load a prompt template from a text file, substituting template variables.
 
     Built-in variables: {current_date}
     Additional variables can be passed via **extra_vars and will be
     substituted as {key} → str(value) in the prompt text.
+
+    Rendered prompts are cached per day — see _prompt_cache above.
     """
+    global _prompt_cache_date
+    today = datetime.today().strftime("%Y-%m-%d")
+    if today != _prompt_cache_date:
+        _prompt_cache.clear()
+        _prompt_cache_date = today
+    cache_key = (filepath, tuple(sorted((k, str(v)) for k, v in extra_vars.items())))
+    cached = _prompt_cache.get(cache_key)
+    if cached is not None:
+        return cached
     resolved = _resolve_path(filepath)
     try:
         raw = Path(resolved).read_text(encoding="utf-8")
@@ -112,9 +132,15 @@ def _load_prompt(filepath: str, **extra_vars) -> str:
             f"Prompt file not found: {resolved}\n"
             f"Expected at: {filepath} (relative to repo root {_REPO_ROOT})"
         )
-    text = raw.replace("{current_date}", datetime.today().strftime("%Y-%m-%d %H:%M:%S"))
+    # Day granularity only: a per-second timestamp in the system prompt
+    # makes every process render a different token prefix, which defeats
+    # vLLM's automatic prefix caching of the SYSTEM+TOOLS preamble shared
+    # by every request. A stable date keeps the prefix byte-identical
+    # across runs (and across root/sub-agent requests) within a day.
+    text = raw.replace("{current_date}", today)
     for key, value in extra_vars.items():
         text = text.replace("{" + key + "}", str(value))
+    _prompt_cache[cache_key] = text
     return text
 
 
@@ -155,6 +181,7 @@ def load_config(path: Optional[str] = None) -> dict:
         _config = _FALLBACK_CONFIG.copy()
 
     _loaded = True
+    _profile_memo.clear()  # profiles may have changed — drop resolved copies
     _update_module_constants()
     return _config
 
@@ -188,6 +215,8 @@ def _update_module_constants():
     global HISTORY_COMPACTION_ENABLED, HISTORY_COMPACTION_MSG_THRESHOLD
     global HISTORY_COMPACTION_MIN_INTERVAL, HISTORY_COMPACTION_RECENT_TURNS
     global RUBRIC_ENABLED, RUBRIC_PROMPT, DRAFT_CRITIQUE_ENABLED, DRAFT_CRITIQUE_PROMPT
+    global STREAM_RESPONSES, PREFETCH_WORKERS, LIVE_TRACE, SPAWN_TRAJECTORY_CACHE, MAX_CONCURRENT_SPAWNS
+    global LLM_CACHE_ENABLED, LLM_CACHE_PATH, LLM_CACHE_TTL_S
 
     c = _config
 
@@ -241,6 +270,27 @@ def _update_module_constants():
     DRAFT_REPORT = agent_cfg.get("draft_report", True)
     DRAFT_FORMAT = agent_cfg.get("draft_format", "qa")  # "qa" (Final Answer/Sources/Details) or "report" (Title/Executive Summary/Sections/Sources)
     VERIFY_BEFORE_PUBLISH = agent_cfg.get("verify_before_publish", True)
+    # Stream chat completions via SSE instead of waiting for the full body.
+    # Cuts time-to-first-token on long generations and lets the turn loop
+    # stop reading as soon as the tool calls are complete.
+    STREAM_RESPONSES = agent_cfg.get("stream_responses", False)
+    # Thread-pool width for the per-turn prefetch of independent
+    # I/O-bound tool calls. 0 disables prefetching entirely.
+    PREFETCH_WORKERS = agent_cfg.get("prefetch_workers", 6)
+    # Thread-pool width for running sibling conduct_research dispatches
+    # in one turn concurrently (runner._prefetch_research_spawns).
+    MAX_CONCURRENT_SPAWNS = agent_cfg.get("max_concurrent_spawns", 4)
+    # Serve a live SSE trace viewer on localhost while dispatch runs
+    # (see live_trace.LiveTraceServer).
+    LIVE_TRACE = agent_cfg.get("live_trace", False)
+    # Reuse sub-agent results for identical (task, context, model, budget)
+    # spawns instead of re-running the whole episode (see tool_store._spawn_cache).
+    SPAWN_TRAJECTORY_CACHE = agent_cfg.get("spawn_trajectory_cache", False)
+    # Exact-match response cache in front of the vLLM round-trip.
+    # Mainly useful during development where identical prompts re-run.
+    LLM_CACHE_ENABLED = agent_cfg.get("llm_cache_enabled", False)
+    LLM_CACHE_PATH = _resolve_path(agent_cfg.get("llm_cache_path", ".cache/llm_cache.sqlite"))
+    LLM_CACHE_TTL_S = agent_cfg.get("llm_cache_ttl_s", 0)
 
     # Verifier model — defaults to the main model/endpoint if not set
     verifier_cfg = c.get("verifier", {})
@@ -329,11 +379,26 @@ def _update_module_constants():
     EVAL_CONFIG = c.get("eval", {})
 
 
+# Resolved-profile memo: dispatch and every recursive sub-agent spawn
+# call get_model_profile, so resolve defaults + per-model overrides once
+# per model name and hand back the same dict. Cleared by load_config.
+_profile_memo: Dict[str, dict] = {}
+
+
 def get_model_profile(model: str) -> dict:
-    """Return the profile for a model, falling back to defaults for unknown models."""
+    """Return the profile for a model, falling back to defaults for unknown models.
+
+    The returned dict is memoized and shared — callers must treat it as
+    read-only. Per-model settings are merged over the default profile,
+    so every default key is always present.
+    """
     if not _loaded:
         load_config()
-    return MODEL_PROFILES.get(model, _DEFAULT_PROFILE)
+    profile = _profile_memo.get(model)
+    if profile is None:
+        profile = {**_DEFAULT_PROFILE, **MODEL_PROFILES.get(model, {})}
+        _profile_memo[model] = profile
+    return profile
 
 
 # ── Auto-load on import ─────────────────────────────────────────────────
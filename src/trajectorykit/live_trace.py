@@ -0,0 +1,680 @@
+"""
+Live trace viewer: a local SSE server that streams turn cards to a
+browser while dispatch() is still running.
+
+Reuses the card renderers from tracing.py, so the live page looks like
+the saved HTML trace — but cards appear as turns complete instead of
+after the episode ends.  Enabled via ``agent.live_trace`` in the YAML
+config; the runner starts one server per root dispatch and pushes each
+TurnRecord as it is finalized.
+
+Rendering and fan-out happen on a dedicated worker thread fed by a
+queue, so push_turn() is a cheap enqueue and the agent loop never
+blocks on HTML work.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import collections
+import dataclasses
+import hashlib
+import gzip
+import json
+import logging
+import queue
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from .utils import _orjson
+from .tracing import (
+    _CSS,
+    _collect_all_images,
+    _esc,
+    _flatten_trace,
+    _render_turn_card,
+    EpisodeTrace,
+    TurnRecord,
+)
+
+logger = logging.getLogger(__name__)
+
+_KEEPALIVE = b": keep-alive\n\n"
+_KEEPALIVE_GZ = gzip.compress(_KEEPALIVE, compresslevel=6, mtime=0)
+
+# Coalescing window for burst pushes: the render worker gathers up to
+# this many turns / this much time into one SSE frame, so a flurry of
+# near-simultaneous completions (parallel sub-agents, prefetched tools)
+# costs one write per burst instead of one per card.
+_BATCH_WINDOW_S = 0.05
+_BATCH_MAX = 16
+
+# Upper bound on a single blocking send to one SSE client — a stalled
+# peer is disconnected rather than holding its handler thread.
+_SEND_TIMEOUT_S = 30
+
+# Finalize images larger than this (decoded bytes) are served from
+# /img/<hash> instead of being inlined as data: URLs — the final card's
+# HTML stays small and the browser only fetches/decodes what scrolls
+# into view.
+_IMG_INLINE_MAX = 32 * 1024
+_IMG_CONTENT_TYPES = {
+    "png": "image/png", "jpg": "image/jpeg", "jpeg": "image/jpeg",
+    "gif": "image/gif", "svg": "image/svg+xml", "pdf": "application/pdf",
+}
+
+
+def _sendv(sock: socket.socket, buffers: List[bytes]) -> None:
+    """Write a batch of frames with vectored sendmsg — one syscall per
+    batch instead of one write+flush per frame — looping on partial sends."""
+    bufs = [memoryview(b) for b in buffers]
+    while bufs:
+        sent = sock.sendmsg(bufs)
+        while bufs and sent >= len(bufs[0]):
+            sent -= len(bufs[0])
+            bufs.pop(0)
+        if sent and bufs:
+            bufs[0] = bufs[0][sent:]
+
+
+def _serialize_turn(turn_record: TurnRecord) -> dict:
+    """Serialize one TurnRecord (including nested child traces) to a dict.
+
+    The trace records are plain dataclasses all the way down — turns,
+    tool calls, and the EpisodeTrace inside a spawn's child_trace — so
+    dataclasses.asdict covers the whole tree in one stdlib walk instead
+    of a per-node isinstance dispatch through a local closure.
+    """
+    return dataclasses.asdict(turn_record)
+
+
+class _SSEHandler(BaseHTTPRequestHandler):
+    """Serves the live page at / and the event stream at /events."""
+
+    def do_GET(self):  # noqa: N802 — http.server API
+        if self.path == "/" or self.path == "/index.html":
+            self._serve_html()
+        elif self.path == "/events":
+            self._serve_sse()
+        elif self.path.startswith("/img/"):
+            self._serve_image(self.path[5:])
+        else:
+            self.send_error(404)
+
+    def _serve_html(self) -> None:
+        # Status line, headers, and body are pre-assembled once in
+        # start() — serving the page is a single write, no per-request
+        # header formatting.
+        self.wfile.write(self.server.html_response)
+
+    def _serve_image(self, key: str) -> None:
+        entry = self.server.live._image_store.get(key)
+        if entry is None:
+            self.send_error(404)
+            return
+        content_type, body = entry
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        # Keyed by content hash, so the bytes never change for a URL.
+        self.send_header("Cache-Control", "max-age=86400, immutable")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _serve_sse(self) -> None:
+        # Frames are text-heavy HTML that compresses 5-10x. Each frame
+        # is pre-compressed once as an independent gzip member (see
+        # _broadcast_sse), so all gzip-capable clients share the same
+        # compressed bytes and the stream is just member concatenation.
+        gz = "gzip" in (self.headers.get("Accept-Encoding") or "")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "keep-alive")
+        if gz:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+
+        live: LiveTraceServer = self.server.live
+        keepalive = _KEEPALIVE_GZ if gz else _KEEPALIVE
+        # A reconnecting EventSource reports the last id: it processed;
+        # replay only the frames it missed instead of the whole log
+        # (which would duplicate every card in the DOM).
+        try:
+            resume_seq = int(self.headers.get("Last-Event-ID", ""))
+        except ValueError:
+            resume_seq = None
+        # Headers went through the buffered wfile; flush before switching
+        # to vectored writes on the raw socket.
+        self.wfile.flush()
+        sock = self.connection
+        # A paused peer (backgrounded tab, sleeping laptop) would other-
+        # wise block sendmsg forever and pin this handler thread. The
+        # shared frame log already bounds memory; the timeout bounds
+        # threads. EventSource reconnects and re-syncs from the log.
+        sock.settimeout(_SEND_TIMEOUT_S)
+        try:
+            # Replay the full event log so late-joining browsers see
+            # every card produced so far, then follow the shared frame
+            # log by sequence number. Frames are shared bytes — no
+            # per-client queues or copies.
+            with live._cond:
+                if resume_seq is None:
+                    replay, last_seq = live._replay_snapshot(gz)
+                else:
+                    replay = live._frames_after(resume_seq, gz)
+                    last_seq = live._seq
+            if replay:
+                _sendv(sock, replay)
+            while True:
+                with live._cond:
+                    notified = live._cond.wait_for(
+                        lambda: live._seq > last_seq, timeout=15)
+                    if notified:
+                        fresh = live._frames_after(last_seq, gz)
+                        last_seq = live._seq
+                if notified:
+                    _sendv(sock, fresh)
+                else:
+                    # Comment frame keeps proxies/browsers from timing out.
+                    sock.sendall(keepalive)
+        except (BrokenPipeError, ConnectionResetError, TimeoutError, OSError):
+            pass
+
+    def log_message(self, format, *args):  # noqa: A002 — http.server API
+        pass  # keep per-request logging off the console
+
+
+class LiveTraceServer:
+    """Streams an episode's turn cards to a browser as they complete.
+
+    Usage (wired up by the runner when ``agent.live_trace`` is set):
+
+        live = LiveTraceServer(state.episode)
+        url = live.start()          # serve in the background
+        ...
+        live.push_turn(turn_record) # per finalized turn — cheap enqueue
+        ...
+        live.finalize(result)       # push the final answer card
+
+    The server stays up after finalize so the page remains viewable; it
+    runs on daemon threads and dies with the process (or via stop()).
+    """
+
+    def __init__(self, episode: EpisodeTrace, host: str = "127.0.0.1",
+                 port: Optional[int] = None):
+        self.episode = episode
+        self.host = host
+        self.port = port
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        # Shared frame log: (seq, frame_bytes) tuples guarded by _cond.
+        # Handlers follow it by sequence number, so a broadcast is one
+        # append + notify_all instead of N per-client queue operations,
+        # and every connection shares the same frame bytes.
+        self._cond = threading.Condition()
+        self._seq = 0
+        # Bounded: long sessions with image-bearing cards would other-
+        # wise grow the replay buffer without limit. Old frames are
+        # evicted; the latest finalize frame is pinned separately so a
+        # late joiner always gets the final answer.
+        self.sse_event_log: collections.deque = collections.deque(maxlen=512)
+        self._latest_finalize: Optional[tuple] = None
+        # Shared card/sub-agent counter in tracing._flatten_trace shape.
+        self._card_counter = [0, 0]
+        # (trace_id, turn_number) pairs already broadcast as cards.
+        # Guards against re-emitting a child trace that reappears in a
+        # later parent turn (e.g. a spawn served from the trajectory
+        # cache). Worker-thread only — no lock needed.
+        self._emitted_child_turn_ids: set = set()
+        # hash → (content_type, bytes) for finalize images served via
+        # /img/<hash>; populated on the worker thread before the frame
+        # referencing a URL is broadcast.
+        self._image_store: Dict[str, tuple] = {}
+        self._push_queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._started_ts = time.time()
+        # Running stat counters, updated per push on the worker thread.
+        # Walking episode.to_dict() per turn instead would be O(N) per
+        # push and O(N²) over the session.
+        self._turns = 0
+        self._prompt_tok = 0
+        self._comp_tok = 0
+        self._subs = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/"
+
+    # ── Lifecycle ──────────────────────────────────────────────────────
+
+    def start(self) -> str:
+        """Bind, start the HTTP server and render worker, return the URL."""
+        html_bytes = _render_live_html(self.episode)
+        # One daemon thread per connected viewer. An asyncio/selectors
+        # single-thread loop would be lighter per client, but this
+        # viewer serves a handful of local browser tabs, the SSE
+        # handlers spend their lives parked in Condition.wait (no GIL
+        # contention), and http.server keeps the handler code tiny —
+        # not worth an event-loop rewrite at this fan-out.
+        # Port 0 lets the kernel assign a free port atomically in the
+        # server's own bind — one syscall, no scan, no TOCTOU window
+        # between probing a port and binding it.
+        httpd = ThreadingHTTPServer((self.host, self.port or 0), _SSEHandler)
+        self.port = httpd.server_port
+        httpd.daemon_threads = True
+        httpd.block_on_close = False  # don't join handler threads on shutdown
+        httpd.live = self
+        httpd.html_response = (
+            b"HTTP/1.0 200 OK\r\n"
+            b"Content-Type: text/html; charset=utf-8\r\n"
+            b"Content-Length: " + str(len(html_bytes)).encode("ascii") + b"\r\n"
+            b"Cache-Control: no-store\r\n"
+            b"\r\n" + html_bytes
+        )
+        self._httpd = httpd
+        threading.Thread(target=httpd.serve_forever, daemon=True,
+                         name="live-trace-http").start()
+        # Card rendering, stats, and SSE fan-out all happen here so
+        # push_turn() returns immediately to the agent loop.
+        self._worker = threading.Thread(target=self._render_worker, daemon=True,
+                                        name="live-trace-render")
+        self._worker.start()
+        return self.url
+
+    def stop(self) -> None:
+        self._push_queue.put(None)
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd = None
+
+    # ── Producer side (agent loop) ─────────────────────────────────────
+
+    def push_turn(self, turn_record: TurnRecord, depth: int = 0) -> None:
+        """Enqueue a finalized turn for rendering. Never blocks."""
+        self._push_queue.put((turn_record, depth))
+
+    def finalize(self, result: Dict[str, Any]) -> None:
+        """Enqueue the final-answer card."""
+        self._push_queue.put(("finalize", result))
+
+    # ── Worker side ────────────────────────────────────────────────────
+
+    def _render_worker(self) -> None:
+        while True:
+            item = self._push_queue.get()
+            if item is None:
+                return
+            stop = False
+            tail = None  # finalize marker drained mid-batch
+            batch = []
+            if item[0] == "finalize":
+                tail = item
+            else:
+                batch.append(item)
+                # Coalesce a burst of pushes into one frame (SSE framing
+                # and the client's DOM/timeline work then run once per
+                # burst, not once per turn).
+                deadline = time.monotonic() + _BATCH_WINDOW_S
+                while len(batch) < _BATCH_MAX:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        nxt = self._push_queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if nxt is None:
+                        stop = True
+                        break
+                    if nxt[0] == "finalize":
+                        tail = nxt
+                        break
+                    batch.append(nxt)
+            try:
+                payloads = []
+                for turn_record, depth in batch:
+                    payloads.extend(self._process_push(turn_record, depth))
+                if payloads:
+                    self._broadcast_sse("turn", payloads)
+                if tail is not None:
+                    self._process_finalize(tail[1])
+            except Exception:
+                logger.exception("live-trace render worker error")
+            if stop:
+                return
+
+    def _count_turn(self, turn_dict: dict) -> None:
+        """Fold one newly pushed turn (and its child traces) into the counters."""
+        self._turns += 1
+        self._prompt_tok += turn_dict.get("prompt_tokens", 0) or 0
+        self._comp_tok += turn_dict.get("completion_tokens", 0) or 0
+        stack = [turn_dict]
+        while stack:
+            turn = stack.pop()
+            for tc in turn.get("tool_calls", []):
+                child = tc.get("child_trace")
+                if child:
+                    self._subs += 1
+                    for sub_turn in child.get("turns", []):
+                        self._prompt_tok += sub_turn.get("prompt_tokens", 0) or 0
+                        self._comp_tok += sub_turn.get("completion_tokens", 0) or 0
+                        stack.append(sub_turn)
+
+    def _process_push(self, turn_record: TurnRecord, depth: int) -> List[dict]:
+        turn_dict = _serialize_turn(turn_record)
+        self._count_turn(turn_dict)
+        self._card_counter[0] += 1
+        card = {
+            "type": "turn",
+            "id": f"card-{self._card_counter[0]}",
+            "depth": depth,
+            "turn": turn_dict,
+            "turn_num": turn_dict.get("turn_number", "?"),
+            "agent_label": "Root" if depth == 0 else f"Sub-Agent #{self._card_counter[1]}",
+        }
+        rendered = [(card, _render_turn_card(card))]
+        # Sub-agent turns arrive nested inside the parent turn's tool
+        # calls; flatten each child trace into its own cards, skipping
+        # sub-turns that an earlier push already put on the wire.
+        for tc in turn_dict.get("tool_calls", []):
+            child = tc.get("child_trace")
+            if child:
+                child = self._prune_emitted(child)
+            if child:
+                for sub in _flatten_trace(child, depth + 1, self._card_counter):
+                    rendered.append((sub, _render_turn_card(sub)))
+        return [
+            {
+                "card_id": c["id"],
+                "depth": c["depth"],
+                "agent_label": c["agent_label"],
+                "turn_num": c["turn_num"],
+                "html": html,
+                "stats": self._get_stats(),
+            }
+            for c, html in rendered
+        ]
+
+    def _prune_emitted(self, trace_dict: dict) -> Optional[dict]:
+        """Drop turns (keyed on trace_id + turn_number) already broadcast.
+
+        Returns the trace dict with only unseen turns, or None when every
+        turn has been emitted before — spawns are synchronous, so a turn
+        seen once is complete and its nested sub-turns were emitted with
+        it.
+        """
+        tid = trace_dict.get("trace_id")
+        all_turns = trace_dict.get("turns", [])
+        kept = []
+        for turn in all_turns:
+            key = (tid, turn.get("turn_number"))
+            if key in self._emitted_child_turn_ids:
+                continue
+            self._emitted_child_turn_ids.add(key)
+            for tc in turn.get("tool_calls", []):
+                child = tc.get("child_trace")
+                if child:
+                    tc["child_trace"] = self._prune_emitted(child)
+            kept.append(turn)
+        if not kept:
+            return None
+        if len(kept) != len(all_turns):
+            trace_dict = {**trace_dict, "turns": kept}
+        return trace_dict
+
+    def _process_finalize(self, result: Dict[str, Any]) -> None:
+        final = result.get("final_response", "") if isinstance(result, dict) else str(result)
+        images = _collect_all_images(self.episode.to_dict())
+        for img in images:
+            raw = img.get("data", "")
+            try:
+                body = base64.b64decode(raw)
+            except (binascii.Error, ValueError):
+                continue
+            if len(body) <= _IMG_INLINE_MAX:
+                continue
+            ext = img.get("filename", "").rsplit(".", 1)[-1].lower()
+            content_type = _IMG_CONTENT_TYPES.get(ext, "application/octet-stream")
+            key = hashlib.sha256(body).hexdigest()[:16]
+            self._image_store[key] = (content_type, body)
+            # Big plots ride as a URL: the finalize frame stays small and
+            # the browser fetches/decodes each image lazily on scroll.
+            img["url"] = f"/img/{key}"
+            img["data"] = ""
+        self._broadcast_sse("finalize", {
+            "final_response": final,
+            "images": images,
+            "stats": self._get_stats(),
+        })
+
+    def _get_stats(self) -> Dict[str, Any]:
+        """Snapshot the running counters — O(1), no trace walk."""
+        return {
+            "turns": self._turns,
+            "prompt_tokens": self._prompt_tok,
+            "completion_tokens": self._comp_tok,
+            "sub_agents": self._subs,
+            "elapsed_s": round(time.time() - self._started_ts, 1),
+        }
+
+    def _replay_snapshot(self, gz: bool = False) -> tuple:
+        """(frames to replay, current seq) for a new client. Caller holds _cond."""
+        idx = 2 if gz else 1
+        replay = []
+        if self._latest_finalize is not None and (
+                not self.sse_event_log
+                or self.sse_event_log[0][0] > self._latest_finalize[0]):
+            # Finalize frame was evicted from the bounded log — pin it
+            # at the front so the final answer always replays.
+            replay.append(self._latest_finalize[idx])
+        replay.extend(frame[idx] for frame in self.sse_event_log)
+        return replay, self._seq
+
+    def _frames_after(self, seq: int, gz: bool = False) -> List[bytes]:
+        """Frames newer than ``seq``, oldest first. Caller holds _cond."""
+        idx = 2 if gz else 1
+        fresh = []
+        for frame in reversed(self.sse_event_log):
+            if frame[0] <= seq:
+                break
+            fresh.append(frame[idx])
+        if fresh and len(fresh) == len(self.sse_event_log) and self.sse_event_log[0][0] > seq + 1:
+            # The client lagged past the bounded window; evicted frames
+            # are gone by design (memory stays O(log), not O(session)).
+            logger.warning(
+                "live-trace client lagging: %d frame(s) evicted before delivery",
+                self.sse_event_log[0][0] - seq - 1)
+        fresh.reverse()
+        return fresh
+
+    def _broadcast_sse(self, event_type: str, payload: dict) -> None:
+        # Payloads are dominated by the rendered card HTML; orjson
+        # escapes and encodes that string in C and already hands back
+        # bytes, so the frame is pure bytes concatenation with no
+        # str round-trip.
+        if _orjson is not None:
+            data_json = _orjson.dumps(payload, default=str)
+        else:
+            data_json = json.dumps(payload, default=str).encode("utf-8")
+        # The id: field lets a reconnecting EventSource report where it
+        # left off via Last-Event-ID, so _serve_sse replays only the
+        # tail. Reading _seq without the lock is fine — the render
+        # worker is the only producer.
+        seq = self._seq + 1
+        msg = (b"id: " + str(seq).encode("ascii")
+               + b"\nevent: " + event_type.encode("ascii")
+               + b"\ndata: " + data_json + b"\n\n")
+        # One gzip member per frame, compressed once and shared by all
+        # gzip-capable connections.
+        frame_gz = gzip.compress(msg, compresslevel=6, mtime=0)
+        with self._cond:
+            self._seq = seq
+            frame = (seq, msg, frame_gz)
+            self.sse_event_log.append(frame)
+            if event_type == "finalize":
+                self._latest_finalize = frame
+            self._cond.notify_all()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# LIVE PAGE
+# ═══════════════════════════════════════════════════════════════════════
+
+_LIVE_CSS_EXTRA = """\
+.live-header { display: flex; align-items: center; gap: 10px; }
+.status-dot { width: 10px; height: 10px; border-radius: 50%; background: #4ade80;
+              animation: live-pulse 1.5s ease-in-out infinite; }
+.status-dot.done { background: #94a3b8; animation: none; }
+@keyframes live-pulse { 0%, 100% { opacity: 1; } 50% { opacity: 0.35; } }
+.live-stats { display: flex; gap: 16px; font-size: 12px; color: #94a3b8;
+              margin: 8px 0 16px; }
+.live-stats b { color: #e2e8f0; font-weight: 600; }
+#final-panel { display: none; margin-top: 24px; border: 1px solid #334155;
+               border-radius: 10px; padding: 16px; }
+#final-panel h2 { margin-top: 0; }
+.final-img img { max-width: 100%; border-radius: 6px; margin-top: 8px; }
+.final-img .img-name { font-size: 11px; color: #64748b; }
+#timeline-list { list-style: none; padding: 0; margin: 0; font-size: 12px; }
+#timeline-list li { padding: 2px 0; }
+#timeline-list li.tl-depth-1 { padding-left: 12px; }
+#timeline-list li.tl-depth-2 { padding-left: 24px; }
+#timeline-list li.tl-depth-3 { padding-left: 36px; }
+#timeline-list a { color: #94a3b8; text-decoration: none; }
+#timeline-list a:hover { color: #e2e8f0; }
+"""
+
+_LIVE_JS = """\
+function toggle(header) {
+  header.closest('.turn-card').classList.toggle('open');
+}
+function toggleTool(header) {
+  header.closest('.tool-block').classList.toggle('open');
+}
+
+var es = new EventSource('/events');
+
+es.addEventListener('turn', function (e) {
+  var msgs = JSON.parse(e.data);  // one frame carries a batch of cards
+  for (var i = 0; i < msgs.length; i++) {
+    addTurnCard(msgs[i]);
+  }
+  updateStats(msgs[msgs.length - 1].stats);
+});
+
+es.addEventListener('finalize', function (e) {
+  var msg = JSON.parse(e.data);
+  showFinal(msg);
+  updateStats(msg.stats);
+});
+
+function addTurnCard(msg) {
+  var holder = document.createElement('div');
+  holder.innerHTML = msg.html;
+  var card = holder.firstElementChild;
+  document.getElementById('cards').appendChild(card);
+  // Timeline grows by one entry per card — append-only, no rebuild.
+  var li = document.createElement('li');
+  li.className = 'tl-depth-' + Math.min(msg.depth, 3);
+  var a = document.createElement('a');
+  a.href = '#' + msg.card_id;
+  a.textContent = msg.agent_label + ' · Turn ' + msg.turn_num;
+  li.appendChild(a);
+  document.getElementById('timeline-list').appendChild(li);
+  card.scrollIntoView({ behavior: 'smooth', block: 'end' });
+}
+
+function updateStats(stats) {
+  if (!stats) return;
+  document.getElementById('st-turns').textContent = stats.turns;
+  document.getElementById('st-subs').textContent = stats.sub_agents;
+  document.getElementById('st-tokens').textContent =
+    stats.prompt_tokens.toLocaleString() + ' in / ' +
+    stats.completion_tokens.toLocaleString() + ' out';
+  document.getElementById('st-elapsed').textContent = stats.elapsed_s + 's';
+}
+
+function escapeHtml(s) {
+  var d = document.createElement('div');
+  d.textContent = s;
+  return d.innerHTML;
+}
+
+function showFinal(msg) {
+  var panel = document.getElementById('final-panel');
+  panel.style.display = 'block';
+  var html = '<div class="output-block">' + escapeHtml(msg.final_response) + '</div>';
+  var images = msg.images || [];
+  for (var i = 0; i < images.length; i++) {
+    var src = images[i].url || ('data:image/png;base64,' + images[i].data);
+    html += '<div class="final-img">' +
+            '<img src="' + src + '" loading="lazy" decoding="async">' +
+            '<div class="img-name">' + escapeHtml(images[i].filename) + '</div></div>';
+  }
+  document.getElementById('final-body').innerHTML = html;
+  document.getElementById('status-dot').classList.add('done');
+  panel.scrollIntoView({ behavior: 'smooth', block: 'start' });
+}
+"""
+
+
+def _render_live_html(episode: EpisodeTrace) -> bytes:
+    """Render the live viewer page for one episode.
+
+    The CSS/JS bulk is constant, so it is encoded once at import into
+    the prefix/suffix byte blobs below; per-episode rendering only
+    formats and encodes the small dynamic header.
+    """
+    question = episode.user_input[:300] + ("\u2026" if len(episode.user_input) > 300 else "")
+    header = (
+        f'<h1>Live Trace <code>{_esc(episode.trace_id)}</code></h1>\n'
+        f'  </div>\n'
+        f'  <div class="meta-line">{_esc(episode.model)} \u00b7 started {_esc(episode.started_at)}</div>\n'
+        f'  <div class="question-block">{_esc(question)}</div>\n'
+    )
+    return _LIVE_HTML_PREFIX_BYTES + header.encode("utf-8") + _LIVE_HTML_SUFFIX_BYTES
+
+
+_LIVE_HTML_PREFIX_BYTES = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Live Trace \u2014 trajectorykit</title>
+<style>
+{_CSS}
+{_LIVE_CSS_EXTRA}
+</style>
+</head>
+<body>
+<div class="layout">
+<aside class="sidebar">
+  <div class="sidebar-title">Timeline</div>
+  <ul id="timeline-list"></ul>
+</aside>
+<main class="content">
+  <div class="live-header">
+    <span class="status-dot" id="status-dot"></span>
+    """.encode("utf-8")
+
+_LIVE_HTML_SUFFIX_BYTES = f"""  <div class="live-stats">
+    <span>turns <b id="st-turns">0</b></span>
+    <span>sub-agents <b id="st-subs">0</b></span>
+    <span>tokens <b id="st-tokens">0</b></span>
+    <span>elapsed <b id="st-elapsed">0s</b></span>
+  </div>
+  <div id="cards"></div>
+  <div id="final-panel">
+    <h2>\U0001f4dd Final Response</h2>
+    <div id="final-body"></div>
+  </div>
+</main>
+</div>
+<script>
+{_LIVE_JS}
+</script>
+</body>
+</html>
+""".encode("utf-8")
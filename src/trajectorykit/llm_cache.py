@@ -0,0 +1,152 @@
+"""
+Application-side response cache for chat completions.
+
+Re-running the same prompt during development (e.g. the examples in
+example.py) re-pays the full generation latency on every run.  This
+cache sits in front of the vLLM round-trip: the key is a BLAKE2b digest
+of the serialized request payload (messages + tools + model + sampling
+params), so an exact re-run returns the stored response immediately.
+Backed by a small sqlite3 database so hits survive process restarts.
+
+Exact-match only — a semantic (embedding-based) fallback would need an
+embedding model in-process, which this tree doesn't carry.  The exact
+key already covers the dominant case: repeated dev runs of identical
+prompts.
+
+Enabled via ``agent.llm_cache_enabled`` in the YAML config, or
+overridden per-process with ``TRAJECTORYKIT_CACHE=off|read|rw``
+(``read`` serves hits without recording new entries — useful for
+replaying a run without polluting the cache).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from . import config as _cfg
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Payload fields that identify a generation. Everything that influences
+# the output goes in; transport details (stream flags) stay out so the
+# streaming and blocking paths share cache entries.
+_KEY_FIELDS = (
+    "model", "messages", "tools", "tool_choice", "temperature",
+    "max_tokens", "reasoning_effort", "chat_template_kwargs",
+)
+
+
+# blake3 hashes large buffers several times faster than blake2b; the
+# serialized messages blob grows with the conversation, so the digest is
+# on the per-call hot path when the cache is enabled. Optional — stdlib
+# blake2b is the fallback. (Entries don't mix: a given environment uses
+# one backend consistently, and a backend switch just misses once.)
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _blake3 = None
+
+
+def cache_key(payload: Dict[str, Any]) -> str:
+    """Deterministic digest of the generation-relevant payload fields."""
+    keyed = {f: payload.get(f) for f in _KEY_FIELDS if f in payload}
+    blob = json.dumps(keyed, sort_keys=True, default=str).encode("utf-8")
+    if _blake3 is not None:
+        return _blake3(blob).hexdigest(length=20)
+    return hashlib.blake2b(blob, digest_size=20).hexdigest()
+
+
+class LLMCache:
+    """sqlite3-backed exact-match cache of chat completion results."""
+
+    def __init__(self, path: str, ttl_seconds: int = 0, read_only: bool = False):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl_seconds  # 0 → never expire
+        self.read_only = read_only
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL keeps readers unblocked while a writer commits — matters
+        # when prefetch threads and the turn loop hit the cache together.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "  key TEXT PRIMARY KEY,"
+            "  result TEXT NOT NULL,"
+            "  created_at REAL NOT NULL"
+            ")"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        result_json, created_at = row
+        if self.ttl and time.time() - created_at > self.ttl:
+            with self._lock:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+            return None
+        try:
+            return json.loads(result_json)
+        except json.JSONDecodeError:
+            return None
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        if self.read_only:
+            return
+        try:
+            result_json = json.dumps(result, default=str)
+        except (TypeError, ValueError):
+            return  # unserializable result — skip caching, never crash the loop
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, result, created_at) VALUES (?, ?, ?)",
+                (key, result_json, time.time()),
+            )
+            self._conn.commit()
+
+
+# ── Module singleton ────────────────────────────────────────────────────
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[LLMCache]:
+    """Return the process-wide cache, or None when disabled.
+
+    The ``TRAJECTORYKIT_CACHE`` env var wins over the YAML flag:
+    ``off`` disables, ``read``/``rw`` enable (``read`` suppresses
+    writes). Unset/unknown values fall back to the config.
+    """
+    mode = os.environ.get("TRAJECTORYKIT_CACHE", "").strip().lower()
+    if mode == "off":
+        return None
+    if mode not in ("read", "rw") and not getattr(_cfg, "LLM_CACHE_ENABLED", False):
+        return None
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = LLMCache(
+                        path=_cfg.LLM_CACHE_PATH,
+                        ttl_seconds=getattr(_cfg, "LLM_CACHE_TTL_S", 0),
+                        read_only=(mode == "read"),
+                    )
+                except sqlite3.Error as e:
+                    logger.warning(f"LLM cache unavailable ({e}) — running uncached")
+                    return None
+    return _cache
@@ -25,6 +25,34 @@ class MemoryEntry:
     
     def __post_init__(self):
         self.content_length = len(self.content)
+        self._content_lower: Optional[str] = None
+        self._lines: Optional[List[str]] = None
+        self._lines_lower: Optional[List[str]] = None
+
+    @property
+    def content_lower(self) -> str:
+        """Lowercased content, computed once per entry.
+
+        recall_memory greps case-insensitively; without the memo every
+        recall re-lowercases a multi-KB blob line by line.
+        """
+        if self._content_lower is None:
+            self._content_lower = self.content.lower()
+        return self._content_lower
+
+    @property
+    def lines(self) -> List[str]:
+        """Content split into lines, computed once per entry (see grep)."""
+        if self._lines is None:
+            self._lines = self.content.split("\n")
+        return self._lines
+
+    @property
+    def lines_lower(self) -> List[str]:
+        """Lowercased line list, computed once per entry (see grep)."""
+        if self._lines_lower is None:
+            self._lines_lower = self.content_lower.split("\n")
+        return self._lines_lower
 
 
 class MemoryStore:
@@ -48,6 +76,20 @@ class MemoryStore:
         self.max_entries = max_entries
         self.max_total_chars = max_total_chars
         self._total_chars = 0
+        # key → entry index so get()/upsert() are one probe instead of a
+        # linear scan.  Points at the *first* entry for a key (matching
+        # the old scan order) and is repaired on eviction.
+        self._index: Dict[str, MemoryEntry] = {}
+
+    def _drop_oldest(self) -> None:
+        dropped = self.entries.pop(0)
+        self._total_chars -= dropped.content_length
+        if self._index.get(dropped.key) is dropped:
+            del self._index[dropped.key]
+            for later in self.entries:  # re-link a later duplicate, if any
+                if later.key == dropped.key:
+                    self._index[later.key] = later
+                    break
     
     def add(
         self,
@@ -78,9 +120,8 @@ class MemoryStore:
                 or self._total_chars + len(content) > self.max_total_chars
             )
         ):
-            dropped = self.entries.pop(0)
-            self._total_chars -= dropped.content_length
-        
+            self._drop_oldest()
+
         entry = MemoryEntry(
             key=key,
             source_tool=tool_name,
@@ -89,14 +130,27 @@ class MemoryStore:
         )
         self.entries.append(entry)
         self._total_chars += entry.content_length
+        self._index.setdefault(key, entry)
         return key
-    
+
     def get(self, key: str) -> Optional[str]:
         """Retrieve content by key."""
-        for entry in self.entries:
-            if entry.key == key:
-                return entry.content
-        return None
+        entry = self._index.get(key)
+        return entry.content if entry is not None else None
+
+    def grep(self, key: str, query: str) -> Optional[List[str]]:
+        """Case-insensitive line search within one entry.
+
+        Returns matching lines in their original casing, or None when
+        the key doesn't exist.  Uses the per-entry lowercase memo so
+        repeated recalls don't re-lowercase the stored blob.
+        """
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+        q_lower = query.lower()
+        lines = entry.lines
+        return [lines[i] for i, ll in enumerate(entry.lines_lower) if q_lower in ll]
     
     def upsert(
         self,
@@ -115,17 +169,20 @@ class MemoryStore:
         Returns:
             The key (same as the input).
         """
-        for entry in self.entries:
-            if entry.key == key:
-                # Update in-place
-                self._total_chars -= entry.content_length
-                entry.content = content
-                entry.content_length = len(content)
-                entry.source_tool = tool_name
-                entry.turn = turn
-                self._total_chars += entry.content_length
-                return key
-        
+        entry = self._index.get(key)
+        if entry is not None:
+            # Update in-place
+            self._total_chars -= entry.content_length
+            entry.content = content
+            entry.content_length = len(content)
+            entry._content_lower = None  # stale memos
+            entry._lines = None
+            entry._lines_lower = None
+            entry.source_tool = tool_name
+            entry.turn = turn
+            self._total_chars += entry.content_length
+            return key
+
         # New entry — enforce limits then append
         while (
             self.entries
@@ -134,9 +191,8 @@ class MemoryStore:
                 or self._total_chars + len(content) > self.max_total_chars
             )
         ):
-            dropped = self.entries.pop(0)
-            self._total_chars -= dropped.content_length
-        
+            self._drop_oldest()
+
         entry = MemoryEntry(
             key=key,
             source_tool=tool_name,
@@ -145,6 +201,7 @@ class MemoryStore:
         )
         self.entries.append(entry)
         self._total_chars += entry.content_length
+        self._index.setdefault(key, entry)
         return key
     
     def keys(self) -> List[str]:
@@ -293,4 +350,5 @@ class MemoryStore:
             )
             store.entries.append(entry)
             store._total_chars += entry.content_length
+            store._index.setdefault(entry.key, entry)
         return store
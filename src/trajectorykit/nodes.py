@@ -20,7 +20,6 @@ import os
 import re
 import random
 import time
-import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
@@ -32,6 +31,7 @@ from .agent_state import AgentState
 from . import config as _cfg
 from .symbolic import make_symbolic
 from .tool_store import dispatch_tool_call, fetch_url
+from .utils import VLLM_CLIENT, fast_json_loads
 from .tracing import ToolCallRecord, TurnRecord
 
 import logging
@@ -45,6 +45,33 @@ NodeResult = Tuple[Optional[str], bool]
 _CONTINUE: NodeResult = (None, False)
 _BREAK: NodeResult = (None, True)
 
+# Strips inline "--- <name> (base64) ---" file blocks from tool outputs
+# before they enter the message history (the full content stays in the
+# trace).  Compiled once — this runs on every large tool output.
+_BASE64_FILE_BLOCK_RE = re.compile(
+    r"(--- .+? \(base64\) ---\n).+?(\n---|$)", re.DOTALL
+)
+
+# Outputs below this size can't carry a base64 payload worth stripping —
+# they land in the context window whole either way — so skip the DOTALL
+# scan entirely for them (the overwhelmingly common case).
+_BASE64_STRIP_MIN_CHARS = 256
+
+
+def _strip_base64_blocks(output: str) -> str:
+    """Replace inline base64 file blocks with a stub, cheaply when possible.
+
+    Two cheap pre-checks elide the DOTALL scan for the common case: a
+    size floor (short outputs can't carry a payload worth stripping) and
+    a literal substring probe for the ``(base64)`` banner, which is a
+    single C-level memmem over the string — far cheaper than running
+    the regex state machine across a large HTML dump that contains no
+    file block at all.
+    """
+    if len(output) < _BASE64_STRIP_MIN_CHARS or "(base64) ---" not in output:
+        return output
+    return _BASE64_FILE_BLOCK_RE.sub(r"\1[file content saved to trace]\2", output)
+
 
 def _finalize(content: str) -> NodeResult:
     return (content, False)
@@ -397,12 +424,12 @@ def _focused_page_summary(
         if max_tokens is not None:
             _summary_payload["max_tokens"] = max_tokens
         _summary_payload["reasoning_effort"] = "high"
-        resp = requests.post(
+        resp = VLLM_CLIENT.post(
             f"{vllm_url}/chat/completions",
             json=_summary_payload,
         )
         if resp.status_code == 200:
-            choices = resp.json().get("choices", [])
+            choices = fast_json_loads(resp.content).get("choices", [])
             if choices:
                 text = choices[0].get("message", {}).get("content") or ""
                 if text and text.strip():
@@ -539,9 +566,9 @@ def _run_verification(state: AgentState, draft_content: str) -> Tuple[bool, str,
         v_api_key = getattr(_cfg, "VERIFIER_API_KEY", "") or ""
         if v_api_key and v_api_url != _cfg.VLLM_API_URL:
             headers["Authorization"] = f"Bearer {v_api_key}"
-        resp = requests.post(f"{v_api_url}/chat/completions", json=payload, headers=headers, timeout=360)
+        resp = VLLM_CLIENT.post(f"{v_api_url}/chat/completions", json=payload, headers=headers, timeout=360)
         if resp.status_code == 200:
-            result = resp.json()
+            result = fast_json_loads(resp.content)
             msg = result.get("choices", [{}])[0].get("message", {})
             # Reasoning models (gpt-5-*) may return content=null; fall back
             # to reasoning_content or empty string.
@@ -629,12 +656,12 @@ def _generate_rubric(state: AgentState) -> Optional[str]:
             headers["Authorization"] = f"Bearer {v_api_key}"
         if state.verbose:
             print(f"       \U0001f4d0 Generating research rubric via {v_model}...")
-        resp = requests.post(
+        resp = VLLM_CLIENT.post(
             f"{v_api_url}/chat/completions", json=payload,
             headers=headers, timeout=120,
         )
         if resp.status_code == 200:
-            msg = resp.json()["choices"][0]["message"]
+            msg = fast_json_loads(resp.content)["choices"][0]["message"]
             raw = (msg.get("content") or msg.get("reasoning_content") or "").strip()
             if state.verbose:
                 print(f"       \U0001f4d0 Rubric generated ({len(raw):,} chars)")
@@ -709,7 +736,7 @@ def _run_draft_critique(
         if state.verbose:
             print(f"       \U0001f50d Critique ({v_model}): evaluating draft "
                   f"(attempt {state.verification_rejections + 1})...")
-        resp = requests.post(
+        resp = VLLM_CLIENT.post(
             f"{v_api_url}/chat/completions", json=payload,
             headers=headers, timeout=300,
         )
@@ -718,7 +745,7 @@ def _run_draft_critique(
                 print(f"       \u26a0\ufe0f  Critique API error ({resp.status_code})")
             return True, "", "", [], {}
 
-        msg = resp.json()["choices"][0]["message"]
+        msg = fast_json_loads(resp.content)["choices"][0]["message"]
         raw_text = (msg.get("content") or msg.get("reasoning_content") or "").strip()
 
         # ── Parse verdict ──────────────────────────────────────────────
@@ -1502,13 +1529,13 @@ def _spot_check_claims(
     else:
         s2_payload["max_tokens"] = state.max_tokens
 
-    compare_resp = requests.post(
+    compare_resp = VLLM_CLIENT.post(
         f"{s2_api_url}/chat/completions",
         json=s2_payload,
         headers=s2_headers,
     )
     if compare_resp.status_code == 200:
-        _cmp_msg = compare_resp.json().get("choices", [{}])[0].get("message", {})
+        _cmp_msg = fast_json_loads(compare_resp.content).get("choices", [{}])[0].get("message", {})
         compare_raw = (_cmp_msg.get("content")
                        or _cmp_msg.get("reasoning_content")
                        or "").strip()
@@ -1694,7 +1721,7 @@ def _spot_check_refusal(state: AgentState, draft_content: str, meta: dict) -> Tu
                 f"INDEPENDENT EVIDENCE:\n{rc_evidence_text}"
             )},
         ]
-        rc_resp = requests.post(
+        rc_resp = VLLM_CLIENT.post(
             f"{_cfg.VLLM_API_URL}/chat/completions",
             json={
                 "model": state.model,
@@ -1705,7 +1732,7 @@ def _spot_check_refusal(state: AgentState, draft_content: str, meta: dict) -> Tu
             },
         )
         if rc_resp.status_code == 200:
-            _rc_msg = rc_resp.json().get("choices", [{}])[0].get("message", {})
+            _rc_msg = fast_json_loads(rc_resp.content).get("choices", [{}])[0].get("message", {})
             rc_raw = (_rc_msg.get("content")
                       or _rc_msg.get("reasoning_content")
                       or "").strip()
@@ -1913,14 +1940,14 @@ def _run_citation_audit(
             audit_payload["max_tokens"] = state.max_tokens
             audit_payload["temperature"] = ca_temp
 
-        audit_resp = requests.post(
+        audit_resp = VLLM_CLIENT.post(
             f"{ca_api_url}/chat/completions",
             json=audit_payload,
             headers=ca_headers,
             timeout=90,
         )
         if audit_resp.status_code == 200:
-            _aud_msg = audit_resp.json().get("choices", [{}])[0].get("message", {})
+            _aud_msg = fast_json_loads(audit_resp.content).get("choices", [{}])[0].get("message", {})
             audit_raw = (_aud_msg.get("content")
                          or _aud_msg.get("reasoning_content")
                          or "").strip()
@@ -2454,24 +2481,33 @@ def handle_conduct_research(
                 print(f"       ⛓ Chain gate: blocked out-of-order dispatch")
             return _CONTINUE
 
-    # ── Task-level deduplication: inject prior findings if similar ─────
-    prior_note = _find_similar_prior_research(state, new_task)
-    if prior_note:
-        existing_ctx = tool_args.get("context", "") or ""
-        tool_args = {**tool_args, "context": (existing_ctx + "\n\n" + prior_note).strip()}
-        if state.verbose:
-            print(f"       ♻  Injected prior research note into sub-agent context")
+    # Consume a concurrently-dispatched result if the runner produced one
+    # (see runner._prefetch_research_spawns) — the prior-research note was
+    # already injected there, so the lookup below only runs on the
+    # sequential path.
+    _prefetched = state.prefetched_tool_results.pop(tool_call["id"], None)
+    if _prefetched is None:
+        # ── Task-level deduplication: inject prior findings if similar ─
+        prior_note = _find_similar_prior_research(state, new_task)
+        if prior_note:
+            existing_ctx = tool_args.get("context", "") or ""
+            tool_args = {**tool_args, "context": (existing_ctx + "\n\n" + prior_note).strip()}
+            if state.verbose:
+                print(f"       ♻  Injected prior research note into sub-agent context")
 
-    tc_start = time.time()
+    tc_start = time.perf_counter()
     child_trace = None
     try:
-        output, child_trace = dispatch_tool_call(
-            "spawn_agent", tool_args,
-            _depth=state.depth, model=state.model,
-            reasoning_effort=state.reasoning_effort,
-            _sandbox_files=state.sandbox_files,
-            _memory_store=state.memory,
-        )
+        if _prefetched is not None:
+            output, child_trace, _spawn_duration = _prefetched
+        else:
+            output, child_trace = dispatch_tool_call(
+                "spawn_agent", tool_args,
+                _depth=state.depth, model=state.model,
+                reasoning_effort=state.reasoning_effort,
+                _sandbox_files=state.sandbox_files,
+                _memory_store=state.memory,
+            )
         if state.verbose and len(output) < 200:
             print(f"       \u2192 {output}")
         elif state.verbose:
@@ -2480,7 +2516,7 @@ def handle_conduct_research(
         output = f"ERROR: {str(e)}"
         if state.verbose:
             print(f"       \u2192 \u274c {output}")
-    tc_duration = round(time.time() - tc_start, 3)
+    tc_duration = _spawn_duration if _prefetched is not None else round(time.perf_counter() - tc_start, 3)
 
     tc_record = ToolCallRecord(
         tool_name="conduct_research", tool_args=tool_args,
@@ -2543,11 +2579,7 @@ def handle_conduct_research(
                 print(f"       ⛓ Resolved chain step {matched_step.step} → {answer_value[:80]}")
 
     # Build the message for context
-    msg_output = re.sub(
-        r"(--- .+? \(base64\) ---\n).+?(\n---|$)",
-        r"\1[file content saved to trace]\2",
-        output, flags=re.DOTALL,
-    )
+    msg_output = _strip_base64_blocks(output)
     if _cfg.SYMBOLIC_REFERENCES and mem_key is not None and len(msg_output) > _cfg.SYMBOLIC_THRESHOLD:
         msg_output = make_symbolic(
             tool_name="conduct_research", tool_args=tool_args,
@@ -2558,7 +2590,7 @@ def handle_conduct_research(
     state.messages.append({
         "role": "tool",
         "tool_call_id": tool_call["id"],
-        "content": str(msg_output),
+        "content": msg_output,
     })
     return _CONTINUE
 
@@ -2578,7 +2610,7 @@ def handle_summarize_webpage(
     if state.depth != 0:
         return _CONTINUE
 
-    tc_start = time.time()
+    tc_start = time.perf_counter()
     sw_url = tool_args.get("url", "")
     sw_focus = tool_args.get("focus", "")
 
@@ -2600,7 +2632,7 @@ def handle_summarize_webpage(
         except Exception as e:
             sw_output = f"ERROR: {str(e)}"
 
-    tc_duration = round(time.time() - tc_start, 3)
+    tc_duration = round(time.perf_counter() - tc_start, 3)
     tc_record = ToolCallRecord(
         tool_name="summarize_webpage", tool_args=tool_args,
         tool_call_id=tool_call["id"], output=sw_output,
@@ -2654,7 +2686,7 @@ def handle_summarize_webpage(
         if state.verbose:
             print(f"       \U0001f4ce Symbolic ref: {len(sw_output):,} \u2192 {len(msg_output):,} chars [{mem_key}]")
     state.messages.append({
-        "role": "tool", "tool_call_id": tool_call["id"], "content": str(msg_output),
+        "role": "tool", "tool_call_id": tool_call["id"], "content": msg_output,
     })
     if state.verbose:
         preview = sw_output[:200].replace('\n', ' ')
@@ -2677,7 +2709,7 @@ def handle_compress_findings(
     if state.depth != 0:
         return _CONTINUE
 
-    tc_start = time.time()
+    tc_start = time.perf_counter()
     cf_focus = tool_args.get("focus", "")
     cf_entries = state.memory.entries
 
@@ -2756,9 +2788,9 @@ def handle_compress_findings(
                 "max_tokens": state.max_tokens,
                 "reasoning_effort": "high",
             }
-            cf_resp = requests.post(f"{_cfg.VLLM_API_URL}/chat/completions", json=cf_payload)
+            cf_resp = VLLM_CLIENT.post(f"{_cfg.VLLM_API_URL}/chat/completions", json=cf_payload)
             if cf_resp.status_code == 200:
-                cf_result = cf_resp.json()
+                cf_result = fast_json_loads(cf_resp.content)
                 cf_choices = cf_result.get("choices", [])
                 if cf_choices:
                     cf_raw = cf_choices[0].get("message", {}).get("content", "")
@@ -2784,7 +2816,7 @@ def handle_compress_findings(
         except Exception as e:
             cf_output = f"ERROR: {str(e)}"
 
-    tc_duration = round(time.time() - tc_start, 3)
+    tc_duration = round(time.perf_counter() - tc_start, 3)
     tc_record = ToolCallRecord(
         tool_name="compress_findings", tool_args=tool_args,
         tool_call_id=tool_call["id"], output=cf_output,
@@ -2969,16 +3001,23 @@ def handle_generic_tool(
             print(f"       \u26d4  Search #{state.consecutive_search_count} hard-blocked (must think())")
         return _CONTINUE
 
-    tc_start = time.time()
+    tc_start = time.perf_counter()
     child_trace = None
+    # Consume a concurrently-prefetched result if the runner produced one
+    # (see runner._prefetch_tool_outputs) \u2014 same output/trace shape, but
+    # the network wait already happened in parallel with sibling calls.
+    _prefetched = state.prefetched_tool_results.pop(tool_call["id"], None)
     try:
-        output, child_trace = dispatch_tool_call(
-            tool_name, tool_args,
-            _depth=state.depth, model=state.model,
-            reasoning_effort=state.reasoning_effort,
-            _sandbox_files=state.sandbox_files,
-            _memory_store=state.memory,
-        )
+        if _prefetched is not None:
+            output, child_trace, _prefetch_duration = _prefetched
+        else:
+            output, child_trace = dispatch_tool_call(
+                tool_name, tool_args,
+                _depth=state.depth, model=state.model,
+                reasoning_effort=state.reasoning_effort,
+                _sandbox_files=state.sandbox_files,
+                _memory_store=state.memory,
+            )
         if state.verbose and len(output) < 200:
             print(f"       \u2192 {output}")
         elif state.verbose:
@@ -2987,11 +3026,14 @@ def handle_generic_tool(
         output = f"ERROR: {str(e)}"
         if state.verbose:
             print(f"       \u2192 \u274c {output}")
-    tc_duration = round(time.time() - tc_start, 3)
+    tc_duration = _prefetched[2] if _prefetched is not None else round(time.perf_counter() - tc_start, 3)
 
     # ── Consecutive error tracking ────────────────────────────────────
     if output.startswith("ERROR:"):
-        error_sig = f"{tool_name}:{output[:200]}"
+        # Tuple hash instead of a composed string: no concatenation
+        # allocation per failing call, and the repeat check is an int
+        # compare rather than a 200-char string compare.
+        error_sig = hash((tool_name, output[:200]))
         if error_sig == state.last_error_signature:
             state.consecutive_error_count += 1
         else:
@@ -3335,11 +3377,7 @@ def handle_generic_tool(
         )
 
     # ── Build message (strip base64, apply symbolic compression) ──────
-    msg_output = re.sub(
-        r"(--- .+? \(base64\) ---\n).+?(\n---|$)",
-        r"\1[file content saved to trace]\2",
-        output, flags=re.DOTALL,
-    )
+    msg_output = _strip_base64_blocks(output)
     if (
         _cfg.SYMBOLIC_REFERENCES
         and state.depth == 0
@@ -3356,7 +3394,7 @@ def handle_generic_tool(
     state.messages.append({
         "role": "tool",
         "tool_call_id": tool_call["id"],
-        "content": str(msg_output),
+        "content": msg_output,
     })
     return _CONTINUE
 
@@ -10,21 +10,45 @@ from __future__ import annotations
 import base64
 import json
 import re
+import sys
 import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-import requests
+import httpx
 
-from .agent_state import AgentState
+from concurrent.futures import ThreadPoolExecutor
+
+from .agent_state import (
+    AgentState,
+    Message,
+    ROLE_ASSISTANT,
+    ROLE_SYSTEM,
+    ROLE_TOOL,
+    ROLE_USER,
+)
 from . import config as _cfg
+from . import llm_cache
 from .nodes import (
     TOOL_HANDLERS,
     handle_generic_tool,
     _CONTINUE,
+    _find_similar_prior_research,
     _generate_rubric,
 )
-from .tool_store import TOOLS
+from .tool_store import TOOLS, dispatch_tool_call
+from .utils import (
+    fast_json_loads,
+    MAX_RETRIES,
+    VLLM_CLIENT,
+    RETRYABLE_HTTP_ERRORS,
+    retry_delay,
+)
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional speedup
+    _orjson = None
 from .tracing import TurnRecord, ToolCallRecord
 
 import logging
@@ -41,6 +65,16 @@ _HALLUCINATED_SUFFIXES = ("commentaryjson", "commentary", "json")
 # Noise characters the model appends to tool names
 _STRIP_CHARS = "][)(}{'\"\n\r\t .…"
 
+# The only keys a sanitized message row may carry (see Message TypedDict)
+_MESSAGE_KEYS = {"role", "content", "tool_calls"}
+
+# Pulls the reported input-token count out of vLLM's context-overflow
+# error message; compiled once since it sits on the error-retry path.
+_INPUT_TOKENS_RE = re.compile(r"has (\d+) input tokens")
+
+# [Stored → key] markers in tool outputs, harvested during compaction.
+_STORED_KEY_RE = re.compile(r"\[Stored → ([^\]]+)\]")
+
 
 def _sanitize_tool_name(raw_name: str, state: AgentState) -> str:
     """Strip common hallucinated suffixes from tool names.
@@ -194,7 +228,11 @@ def _extract_tool_results(messages: list, max_chars: int = 4000) -> str:
     return "\n---\n".join(tool_results)
 
 
-def _build_fallback_response(messages: list, findings: Optional[list] = None) -> str:
+def _build_fallback_response(
+    messages: list,
+    findings: Optional[list] = None,
+    last_assistant_content: str = "",
+) -> str:
     """Build a response from message history when synthesis fails.
 
     If findings are provided (from state.findings), prefer them over
@@ -231,7 +269,11 @@ def _build_fallback_response(messages: list, findings: Optional[list] = None) ->
                 + findings_text
             )
 
-    # Third: check assistant content
+    # Third: check assistant content.  The turn loop tracks the last
+    # non-empty content inline (state.last_assistant_content), so the
+    # reverse scan is only a safety net for callers without it.
+    if last_assistant_content.strip():
+        return last_assistant_content
     for msg in reversed(messages):
         if msg.get("role") == "assistant":
             content = msg.get("content", "") or ""
@@ -250,12 +292,16 @@ def _build_fallback_response(messages: list, findings: Optional[list] = None) ->
 # API CALL HELPER
 # ═══════════════════════════════════════════════════════════════════════
 
-def call_api(
+# The pooled keep-alive client lives in utils so the handler nodes'
+# direct vLLM/verifier calls share the same connection pool as the
+# turn loop (see utils.VLLM_CLIENT).
+
+def _build_payload(
     state: AgentState,
     effective_max_tokens: int,
     tools_override: Optional[List[dict]] = None,
-) -> requests.Response:
-    """Build payload and call the chat completions API."""
+) -> dict:
+    """Build the chat completions request payload."""
     payload = {
         "model": state.model,
         "messages": state.messages,
@@ -269,7 +315,283 @@ def call_api(
     chat_template_kwargs = state.profile.get("chat_template_kwargs")
     if chat_template_kwargs:
         payload["chat_template_kwargs"] = chat_template_kwargs
-    return requests.post(f"{_cfg.VLLM_API_URL}/chat/completions", json=payload)
+    return payload
+
+
+# ── Pre-serialized tools fragment ──────────────────────────────────────
+# The tools schema list is by far the largest static piece of every
+# request, yet the JSON encoder re-walks it on each POST. With orjson
+# installed we encode each distinct tools list once and splice the
+# cached bytes into a manually assembled body. Entries keep a strong
+# reference to the list so an id() can never be recycled onto a stale
+# encoding; the identity check is belt-and-braces on top of that.
+_TOOLS_JSON_CACHE: Dict[int, tuple] = {}
+_TOOLS_JSON_CACHE_MAX = 32
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+def _warm_tools_json_cache() -> None:
+    """Pre-encode the canonical tool tuples at import.
+
+    The cache above fills lazily, so the first request per process (and
+    per role — root, worker, synthesizer) still paid the multi-KB dumps
+    inline. The four tool selections are frozen module-level tuples, so
+    encoding them once here moves that cost to import time and every
+    request ships pre-serialized bytes.
+    """
+    if _orjson is None:
+        return
+    from .agent_state import _SYNTHESIZER_TOOLS, _WORKER_TOOLS
+    from .tool_store import ROOT_TOOLS
+    for tools in (TOOLS, ROOT_TOOLS, _WORKER_TOOLS, _SYNTHESIZER_TOOLS):
+        _TOOLS_JSON_CACHE[id(tools)] = (tools, _orjson.dumps(tools))
+
+
+_warm_tools_json_cache()
+
+
+def _encode_payload(payload: dict) -> Optional[bytes]:
+    """Encode a request payload, reusing the cached tools encoding.
+
+    Returns None when orjson is unavailable; callers then fall back to
+    httpx's stdlib ``json=`` path.
+    """
+    if _orjson is None:
+        return None
+    tools = payload.get("tools")
+    tools_bytes = None
+    if isinstance(tools, (list, tuple)):
+        entry = _TOOLS_JSON_CACHE.get(id(tools))
+        if entry is not None and entry[0] is tools:
+            tools_bytes = entry[1]
+        elif len(_TOOLS_JSON_CACHE) < _TOOLS_JSON_CACHE_MAX:
+            tools_bytes = _orjson.dumps(tools)
+            _TOOLS_JSON_CACHE[id(tools)] = (tools, tools_bytes)
+    if tools_bytes is None:
+        return _orjson.dumps(payload)
+    rest = {k: v for k, v in payload.items() if k != "tools"}
+    return b'{"tools":' + tools_bytes + b"," + _orjson.dumps(rest)[1:]
+
+
+def call_api(
+    state: AgentState,
+    effective_max_tokens: int,
+    tools_override: Optional[List[dict]] = None,
+) -> httpx.Response:
+    """Build payload and call the chat completions API.
+
+    Goes through the pooled keep-alive client, retrying transient
+    transport failures (connection reset, pool timeout) with
+    exponential backoff before giving up.
+    """
+    payload = _build_payload(state, effective_max_tokens, tools_override)
+    url = f"{_cfg.VLLM_API_URL}/chat/completions"
+    body = _encode_payload(payload)
+    for attempt in range(MAX_RETRIES):
+        try:
+            if body is not None:
+                return VLLM_CLIENT.post(url, content=body, headers=_JSON_HEADERS)
+            return VLLM_CLIENT.post(url, json=payload)
+        except RETRYABLE_HTTP_ERRORS:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            time.sleep(retry_delay(attempt))
+    raise RuntimeError("unreachable")  # loop always returns or raises
+
+
+def _call_api_stream(
+    state: AgentState,
+    effective_max_tokens: int,
+    tools_override: Optional[List[dict]] = None,
+    on_tool_call=None,
+) -> tuple:
+    """Call the chat completions API with SSE streaming.
+
+    Accumulates ``delta.content`` / ``delta.tool_calls`` chunks into the
+    same ``{"choices": [{"message": ...}], "usage": ...}`` shape that the
+    non-streaming path produces, so the rest of the turn loop is
+    agnostic to how the response arrived.  Once the choice reports a
+    finish_reason and the usage frame has arrived, we stop reading —
+    no need to await trailing whitespace or the ``[DONE]`` sentinel.
+
+    Returns (status_code, result_dict).
+    """
+    payload = _build_payload(state, effective_max_tokens, tools_override)
+    payload["stream"] = True
+    # Ask vLLM to append a usage frame so token accounting still works.
+    payload["stream_options"] = {"include_usage": True}
+
+    url = f"{_cfg.VLLM_API_URL}/chat/completions"
+    body = _encode_payload(payload)
+    for attempt in range(MAX_RETRIES):
+        try:
+            if body is not None:
+                stream_cm = VLLM_CLIENT.stream("POST", url, content=body, headers=_JSON_HEADERS)
+            else:
+                stream_cm = VLLM_CLIENT.stream("POST", url, json=payload)
+            with stream_cm as resp:
+                return _consume_sse_stream(resp, on_tool_call=on_tool_call)
+        except RETRYABLE_HTTP_ERRORS:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            time.sleep(retry_delay(attempt))
+    raise RuntimeError("unreachable")  # loop always returns or raises
+
+
+def _consume_sse_stream(resp: httpx.Response, on_tool_call=None) -> tuple:
+    """Accumulate an open SSE response into (status_code, result_dict).
+
+    ``on_tool_call`` (optional) is invoked with each tool-call slot as
+    soon as its arguments finish streaming — i.e. when the next slot
+    index starts, or at finish_reason — letting the caller overlap tool
+    execution with the remaining token stream.  Hook errors are
+    swallowed; the accumulated message is authoritative either way.
+    """
+    if resp.status_code != 200:
+        body = resp.read()
+        try:
+            return resp.status_code, json.loads(body)
+        except ValueError:
+            return resp.status_code, {"error": {"message": body[:500].decode("utf-8", "replace")}}
+
+    content_parts: List[str] = []
+    tool_call_slots: Dict[int, dict] = {}
+    usage: dict = {}
+    role = "assistant"
+    finish_reason = None
+    open_idx = None  # slot currently receiving argument chunks
+
+    def _slot_done(idx) -> None:
+        if on_tool_call is None or idx is None:
+            return
+        try:
+            on_tool_call(tool_call_slots[idx])
+        except Exception:
+            pass
+
+    try:
+        for line in resp.iter_lines():
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            try:
+                chunk = fast_json_loads(data)
+            except json.JSONDecodeError:
+                continue
+            if chunk.get("usage"):
+                usage = chunk["usage"]
+            choices = chunk.get("choices") or []
+            if not choices:
+                # usage-only frame; if generation already finished we're done
+                if finish_reason is not None and usage:
+                    break
+                continue
+            choice = choices[0]
+            delta = choice.get("delta") or {}
+            if delta.get("role"):
+                role = delta["role"]
+            if delta.get("content"):
+                content_parts.append(delta["content"])
+            for tc in delta.get("tool_calls") or []:
+                idx = tc.get("index", 0)
+                if open_idx is not None and idx != open_idx:
+                    _slot_done(open_idx)  # previous slot is complete
+                open_idx = idx
+                slot = tool_call_slots.setdefault(idx, {
+                    "id": "", "type": "function",
+                    "function": {"name": "", "arguments": ""},
+                })
+                if tc.get("id"):
+                    slot["id"] = tc["id"]
+                fn = tc.get("function") or {}
+                if fn.get("name"):
+                    slot["function"]["name"] += fn["name"]
+                if fn.get("arguments"):
+                    slot["function"]["arguments"] += fn["arguments"]
+            if choice.get("finish_reason"):
+                finish_reason = choice["finish_reason"]
+                _slot_done(open_idx)
+                open_idx = None
+                if usage:
+                    break  # early abort: generation + usage both complete
+    finally:
+        resp.close()
+
+    message: dict = {"role": role, "content": "".join(content_parts)}
+    if tool_call_slots:
+        message["tool_calls"] = [tool_call_slots[i] for i in sorted(tool_call_slots)]
+    return 200, {
+        "choices": [{"message": message, "finish_reason": finish_reason}],
+        "usage": usage,
+    }
+
+
+# Bytes-level twin of _INPUT_TOKENS_RE so the overflow error path can
+# grep the raw body without materializing it through the JSON parser.
+_INPUT_TOKENS_RE_BYTES = re.compile(rb"has (\d+) input tokens")
+
+
+def _decode_error_body(body: bytes, status_code: int) -> dict:
+    """Decode a non-200 response body into the ``{"error": {...}}`` shape.
+
+    Error bodies are small but not guaranteed to be JSON — proxies
+    return HTML 502 pages and overloaded servers truncate mid-write.
+    The context-overflow case is grepped straight off the raw bytes
+    (the loop only needs the "has N input tokens" message text), and
+    anything unparseable degrades to a plain message instead of raising
+    out of dispatch.
+    """
+    if _INPUT_TOKENS_RE_BYTES.search(body):
+        return {"error": {"message": body.decode("utf-8", errors="replace"), "code": status_code}}
+    try:
+        result = fast_json_loads(body)
+        if isinstance(result, dict):
+            return result
+    except Exception:
+        pass
+    return {"error": {"message": body.decode("utf-8", errors="replace"), "code": status_code}}
+
+
+def _chat_completion(
+    state: AgentState,
+    effective_max_tokens: int,
+    tools_override: Optional[List[dict]] = None,
+) -> tuple:
+    """Call the API (streaming or not, per config) → (status_code, result).
+
+    When the LLM cache is enabled, an exact payload match skips the
+    round-trip entirely; successful responses are stored on the way out.
+    """
+    cache = llm_cache.get_cache()
+    key = None
+    if cache is not None:
+        key = llm_cache.cache_key(_build_payload(state, effective_max_tokens, tools_override))
+        cached = cache.get(key)
+        if cached is not None:
+            if state.verbose:
+                print("   💾 LLM cache hit — skipping vLLM round-trip")
+            return 200, cached
+
+    if getattr(_cfg, "STREAM_RESPONSES", False):
+        status_code, result = _call_api_stream(
+            state, effective_max_tokens, tools_override,
+            on_tool_call=_early_prefetch_hook(state))
+    else:
+        response = call_api(state, effective_max_tokens, tools_override)
+        # Decode the raw body directly — on large completions this skips
+        # httpx's charset dance and uses orjson when installed.
+        status_code = response.status_code
+        if status_code != 200:
+            result = _decode_error_body(response.content, status_code)
+        else:
+            result = fast_json_loads(response.content)
+
+    if (cache is not None and key is not None and status_code == 200
+            and result.get("choices") and not result.get("error")):
+        cache.set(key, result)
+    return status_code, result
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -281,21 +603,26 @@ def _finalize(state: AgentState, final_content: str) -> Dict[str, Any]:
     state.episode.final_response = final_content
     state.episode.total_turns = state.turn
     state.episode.total_tool_calls = state.total_tool_calls
+    # Wall clock for the human-readable stamp, monotonic for the duration
+    # (immune to NTP slews; no tz resolution on the delta path).
     state.episode.ended_at = datetime.now().isoformat()
-    state.episode.duration_s = round(time.time() - state.episode_start, 3)
+    state.episode.duration_s = round(time.perf_counter() - state.episode_start, 3)
     state.episode.compute_recursive_stats()
     # Attach chain plan snapshot to the trace
     if state.chain_plan is not None:
         state.episode.chain_plan = state.chain_plan.to_dict()
     if getattr(state, "rubric", None):
         state.episode.rubric = state.rubric
-    return {
+    result = {
         "final_response": final_content,
         "turns": state.turn,
         "tool_calls": state.total_tool_calls,
         "messages": state.messages,
         "trace": state.episode,
     }
+    if state.live_server is not None:
+        state.live_server.finalize(result)
+    return result
 
 
 # ═══════════════════════════════════════════════════════════════════════
@@ -308,7 +635,9 @@ def _compact_history(state: AgentState) -> None:
     """Replace old messages with a compact summary, keeping recent turns.
 
     Preserves:
-      - msg[0] (system prompt) and msg[1] (user question)
+      - The pinned prefix (``state.pinned_prefix`` messages): system
+        prompt, the shared-context row when the spawn had one, and the
+        task
       - A synthetic summary of evicted messages
       - The last ``_RECENT_TURNS_KEEP`` turn-groups (assistant + tool msgs)
 
@@ -317,10 +646,16 @@ def _compact_history(state: AgentState) -> None:
     the message list.  The chain plan and draft are re-injected every
     turn by ``_inject_pre_turn``, so evicting their old injections is
     safe.
+
+    Invariant: the history is append-only between compactions, and
+    compaction itself keeps the pinned message objects (not copies), so
+    the serialized prefix stays byte-identical turn over turn — which
+    is what lets vLLM's prefix cache skip re-prefilling the shared head.
     """
     msgs = state.messages
     if len(msgs) < _cfg.HISTORY_COMPACTION_MSG_THRESHOLD:
         return  # nothing to do
+    pin = state.pinned_prefix
 
     # ── Find the "recent window" boundary ─────────────────────────────
     #  Walk backwards counting assistant messages (each one starts a
@@ -328,17 +663,17 @@ def _compact_history(state: AgentState) -> None:
     keep_from = len(msgs)  # index from which we keep everything
     asst_seen = 0
     recent_keep = _cfg.HISTORY_COMPACTION_RECENT_TURNS
-    for i in range(len(msgs) - 1, 1, -1):  # skip msg[0] and msg[1]
+    for i in range(len(msgs) - 1, pin - 1, -1):  # skip the pinned prefix
         if msgs[i].get("role") == "assistant":
             asst_seen += 1
             if asst_seen >= recent_keep:
                 keep_from = i
                 break
     # Safety: never evict if we can't find enough turns
-    if keep_from <= 2:
+    if keep_from <= pin:
         return
 
-    evicted = msgs[2:keep_from]  # everything between header and recent
+    evicted = msgs[pin:keep_from]  # everything between header and recent
     if not evicted:
         return
 
@@ -355,8 +690,7 @@ def _compact_history(state: AgentState) -> None:
                 tool_counts[tname] = tool_counts.get(tname, 0) + 1
         elif role == "tool":
             # Capture any [Stored → key] references
-            import re as _re_compact
-            for match in _re_compact.finditer(r'\[Stored → ([^\]]+)\]', content):
+            for match in _STORED_KEY_RE.finditer(content):
                 mem_keys.append(match.group(1))
 
     # Tool call summary line
@@ -394,6 +728,30 @@ def _compact_history(state: AgentState) -> None:
     if state.research_log:
         research_log_line = "\n\n" + _render_research_log(state)
 
+    # Depth-appropriate tail: the root orchestrator leans on its draft
+    # and memory keys; workers get their findings digest inline so the
+    # evicted tool outputs aren't re-fetched.
+    if state.depth == 0:
+        tail = (
+            "All research data remains accessible via memory_keys in "
+            "conduct_research(). Your draft is the canonical summary of "
+            "prior findings — focus on remaining gaps."
+        )
+    else:
+        findings_digest = ""
+        if state.findings:
+            recent = state.findings[-10:]
+            findings_digest = (
+                "Key findings from the archived turns:\n"
+                + "\n".join(f"  - {f[:300]}" for f in recent)
+                + "\n\n"
+            )
+        tail = (
+            f"{findings_digest}"
+            "Use these findings — do NOT repeat the archived searches. "
+            "Gather only what is still missing, then call final_answer."
+        )
+
     summary = (
         f"[HISTORY COMPRESSED — earlier messages archived]\n"
         f"Tool calls in archived turns: {tool_line}\n"
@@ -401,17 +759,13 @@ def _compact_history(state: AgentState) -> None:
         f"{chain_line}"
         f"{draft_line}"
         f"{research_log_line}\n\n"
-        f"All research data remains accessible via memory_keys in "
-        f"conduct_research(). Your draft is the canonical summary of "
-        f"prior findings — focus on remaining gaps."
+        f"{tail}"
     )
 
     # ── Splice ────────────────────────────────────────────────────────
     recent = msgs[keep_from:]
-    state.messages = [
-        msgs[0],                                        # system prompt
-        msgs[1],                                        # user question
-        {"role": "system", "content": summary},          # compressed history
+    state.messages = list(msgs[:pin]) + [               # system [+ context] + task
+        {"role": ROLE_SYSTEM, "content": summary},          # compressed history
     ] + recent
 
     if state.verbose:
@@ -466,7 +820,7 @@ def _inject_pre_turn(state: AgentState) -> Optional[List[dict]]:
             and state.chain_plan.has_chain and state.turn <= 2):
         chain_msg = state.chain_plan.render()
         if chain_msg:
-            state.messages.append({"role": "system", "content": chain_msg})
+            state.messages.append({"role": ROLE_SYSTEM, "content": chain_msg})
             if state.verbose:
                 print(f"⛓  Injected chain plan (turn {state.turn})")
 
@@ -477,7 +831,7 @@ def _inject_pre_turn(state: AgentState) -> Optional[List[dict]]:
             and getattr(_cfg, "RUBRIC_ENABLED", False)):
         state.rubric = _generate_rubric(state)
         if state.rubric:
-            state.messages.append({"role": "system", "content": (
+            state.messages.append({"role": ROLE_SYSTEM, "content": (
                 "📐 RESEARCH QUALITY RUBRIC (generated by external critic):\n"
                 "This rubric defines what an excellent answer looks like for this question. "
                 "Use it to plan your research tasks and ensure full coverage before drafting.\n\n"
@@ -496,12 +850,12 @@ def _inject_pre_turn(state: AgentState) -> Optional[List[dict]]:
         if (state.chain_plan is not None and state.chain_plan.has_chain
                 and not state.chain_plan.all_resolved()):
             plan_msg += "\n\n" + state.chain_plan.render()
-        state.messages.append({"role": "system", "content": plan_msg})
+        state.messages.append({"role": ROLE_SYSTEM, "content": plan_msg})
         if state.verbose:
             print(f"\U0001f4cb  Injected research plan (turn {state.turn})")
     elif state.plan is None and state.turn > 1 and state.turn % _REMINDER_INTERVAL == 0:
         q_snippet = state.user_input[:300] + ("\u2026" if len(state.user_input) > 300 else "")
-        state.messages.append({"role": "system", "content": (
+        state.messages.append({"role": ROLE_SYSTEM, "content": (
             f"\U0001f50e REMINDER \u2014 You are answering this question:\n"
             f"{q_snippet}\n\n"
             "Stay focused on gathering information relevant to this question. "
@@ -520,7 +874,7 @@ def _inject_pre_turn(state: AgentState) -> Optional[List[dict]]:
                  or (state.plan is not None and state.plan.should_inject(state.turn)))):
         _log_text = _render_research_log(state)
         if _log_text:
-            state.messages.append({"role": "system", "content": _log_text})
+            state.messages.append({"role": ROLE_SYSTEM, "content": _log_text})
             if state.verbose:
                 print(f"📋  Injected research log ({len(state.research_log)} entries)")
 
@@ -534,7 +888,7 @@ def _inject_pre_turn(state: AgentState) -> Optional[List[dict]]:
         _prev_note = ""
         if _ver > 1:
             _prev_note = f"  ({_ver - 1} previous version{'s' if _ver > 2 else ''} available via read_draft)\n"
-        state.messages.append({"role": "system", "content": (
+        state.messages.append({"role": ROLE_SYSTEM, "content": (
             f"\U0001f4c4 YOUR CURRENT DRAFT (v{_ver}, saved turn {_draft_turn}, "
             f"{len(_draft_text):,} chars):\n"
             f"{_draft_text}\n\n"
@@ -556,6 +910,18 @@ def _inject_pre_turn(state: AgentState) -> Optional[List[dict]]:
         _compact_history(state)
         state._last_truncation_turn = state.turn
 
+    # ── History compaction (sub-agents) ───────────────────────────────
+    # Workers re-send every past tool output on every turn even though
+    # their findings digest lives on state.findings.  Evict old turns
+    # the same memento-style way as at root — no draft requirement,
+    # since the findings digest is inlined into the summary instead.
+    if (state.depth > 0
+            and _cfg.HISTORY_COMPACTION_ENABLED
+            and len(state.messages) > _cfg.HISTORY_COMPACTION_MSG_THRESHOLD
+            and state.turn - state._last_truncation_turn >= _cfg.HISTORY_COMPACTION_MIN_INTERVAL):
+        _compact_history(state)
+        state._last_truncation_turn = state.turn
+
     # ── Tool gates (root only) ────────────────────────────────────────
     #
     # We always tell the model WHY a tool is hidden so it doesn't
@@ -628,7 +994,7 @@ def _inject_pre_turn(state: AgentState) -> Optional[List[dict]]:
                 + "\n- ".join(_hidden_reasons)
                 + "\n\nAll other tools are available normally."
             )
-            state.messages.append({"role": "system", "content": _gate_msg})
+            state.messages.append({"role": ROLE_SYSTEM, "content": _gate_msg})
         if state.verbose:
             print(f"\U0001f512  Hidden tools: {_hidden_tools}")
 
@@ -647,7 +1013,7 @@ def _inject_pre_turn(state: AgentState) -> Optional[List[dict]]:
 
             # Periodic checkpoint
             if state.turn > 0 and state.turn % _ckpt_interval == 0 and remaining >= _ckpt_interval:
-                state.messages.append({"role": "system", "content": (
+                state.messages.append({"role": ROLE_SYSTEM, "content": (
                     f"\U0001f4ca CHECKPOINT (turn {state.turn}/{state.turn_length}): "
                     "Pause and assess your progress.\n"
                     "  1. What key facts have you found so far?\n"
@@ -672,7 +1038,7 @@ def _inject_pre_turn(state: AgentState) -> Optional[List[dict]]:
                         + "\n".join(f"  {i+1}. {f[:300]}" for i, f in enumerate(recent))
                         + "\n"
                     )
-                state.messages.append({"role": "system", "content": (
+                state.messages.append({"role": ROLE_SYSTEM, "content": (
                     "\u26a0\ufe0f BUDGET WARNING: You have 4 turns remaining (including this one). "
                     "Start synthesizing NOW. Call final_answer with everything you have gathered.\n"
                     f"{findings_recap}\n"
@@ -681,7 +1047,7 @@ def _inject_pre_turn(state: AgentState) -> Optional[List[dict]]:
                     "real data is better than no answer."
                 )})
             elif remaining == 2:
-                state.messages.append({"role": "system", "content": (
+                state.messages.append({"role": ROLE_SYSTEM, "content": (
                     "\U0001f6a8 FINAL WARNING: 3 turns left. Call final_answer THIS TURN "
                     "or NEXT TURN with your research. Do NOT start new searches."
                 )})
@@ -696,7 +1062,7 @@ def _inject_pre_turn(state: AgentState) -> Optional[List[dict]]:
                         + "\n".join(f"  - {f[:400]}" for f in recent)
                         + "\n"
                     )
-                state.messages.append({"role": "system", "content": (
+                state.messages.append({"role": ROLE_SYSTEM, "content": (
                     "\U0001f6a8 LAST CHANCE: 2 turns remaining. Call final_answer NOW "
                     "with a comprehensive answer using everything below."
                     f"{findings_dump}"
@@ -711,6 +1077,195 @@ def _inject_pre_turn(state: AgentState) -> Optional[List[dict]]:
     return tools_for_turn
 
 
+# ═══════════════════════════════════════════════════════════════════════
+# CONCURRENT TOOL-CALL PREFETCH
+# ═══════════════════════════════════════════════════════════════════════
+#
+# When a turn emits several independent I/O-bound tool calls (search,
+# fetch, etc.), executing them serially costs sum(durations).  We run
+# the actual network work concurrently in a bounded thread pool and
+# stash results keyed by tool_call id; handle_generic_tool() consumes
+# them in the original order, so message ordering and all sequential
+# state mutation (error tracking, nudges) are unchanged.
+#
+# Only pure I/O wrappers are safe to prefetch — they don't touch
+# AgentState.  spawn_agent, execute_code and the virtual root tools
+# stay on the sequential path.
+
+_PREFETCH_SAFE_TOOLS = frozenset({
+    "search_web", "fetch_url", "read_pdf", "extract_tables",
+    "wikipedia_lookup", "fetch_cached", "read_page",
+})
+
+
+# Shared bounded pool for calls launched while the response is still
+# streaming (see _early_prefetch_hook): module-level so worker threads
+# are reused across turns and total concurrency stays bounded.
+_STREAM_PREFETCH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="stream-prefetch")
+
+# Dedicated pool for sibling conduct_research dispatches (see
+# _prefetch_research_spawns).  Kept separate from _STREAM_PREFETCH_POOL:
+# a sub-agent running inside a spawn worker submits its own streaming
+# prefetches, and sharing one bounded pool for both levels could fill it
+# with parents blocked on children that can never be scheduled.
+_SPAWN_POOL = ThreadPoolExecutor(
+    max_workers=getattr(_cfg, "MAX_CONCURRENT_SPAWNS", 4),
+    thread_name_prefix="research-spawn")
+
+
+def _run_prefetch_call(state: AgentState, name: str, args: dict) -> tuple:
+    """Execute one prefetch-safe tool call, returning (output, child, duration)."""
+    t0 = time.perf_counter()
+    try:
+        out, child = dispatch_tool_call(
+            name, args,
+            _depth=state.depth, model=state.model,
+            reasoning_effort=state.reasoning_effort,
+            _sandbox_files=state.sandbox_files,
+            _memory_store=state.memory,
+        )
+    except Exception as e:
+        out, child = f"ERROR: {str(e)}", None
+    return out, child, round(time.perf_counter() - t0, 3)
+
+
+def _early_prefetch_hook(state: AgentState):
+    """Build the streaming ``on_tool_call`` hook, or None when disabled.
+
+    Mirrors _prefetch_tool_outputs' eligibility rules (prefetch-safe
+    tools only, sub-agent search budget), so a call is launched mid-
+    stream only if the prefetch step would have run it anyway.  This
+    overlaps tool I/O with the tail of the token stream — by the time
+    the message is fully assembled, earlier tool calls are in flight.
+    """
+    if getattr(_cfg, "PREFETCH_WORKERS", 6) <= 0:
+        return None
+    budget = [state.MAX_CONSECUTIVE_SEARCHES - state.consecutive_search_count]
+
+    def hook(slot: dict) -> None:
+        name = slot["function"]["name"].split("<|")[0]
+        if name not in _PREFETCH_SAFE_TOOLS:
+            return
+        tc_id = slot.get("id")
+        if not tc_id or tc_id in state.prefetch_futures:
+            return
+        if state.depth > 0:
+            if budget[0] <= 0:
+                return
+            budget[0] -= 1
+        try:
+            args = fast_json_loads(slot["function"]["arguments"] or "{}")
+        except json.JSONDecodeError:
+            return  # malformed args go through the sequential recovery ladder
+        if not isinstance(args, dict):
+            return
+        state.prefetch_futures[tc_id] = _STREAM_PREFETCH_POOL.submit(
+            _run_prefetch_call, state, name, args)
+
+    return hook
+
+
+def _prefetch_tool_outputs(state: AgentState, parsed_calls: List[tuple]) -> None:
+    """Run independent I/O-bound tool calls concurrently, caching results.
+
+    Results land in ``state.prefetched_tool_results`` keyed by tool_call
+    id as ``(output, child_trace, duration_s)`` tuples.  Calls that the
+    consecutive-search gate would block are left for the sequential path
+    so the blocking semantics stay identical.  Pool width comes from
+    ``agent.prefetch_workers`` (0 disables).  Duplicate calls — same
+    tool, same arguments — share one execution.
+    """
+    max_workers = getattr(_cfg, "PREFETCH_WORKERS", 6)
+    if max_workers <= 0:
+        return
+
+    # Collect anything already launched while the response streamed.
+    for tc_id, fut in state.prefetch_futures.items():
+        state.prefetched_tool_results[tc_id] = fut.result()
+    state.prefetch_futures.clear()
+
+    candidates = []
+    search_budget = state.MAX_CONSECUTIVE_SEARCHES - state.consecutive_search_count
+    for tool_call, tool_name, tool_args, _ in parsed_calls:
+        if tool_name not in _PREFETCH_SAFE_TOOLS:
+            continue
+        if state.depth > 0:
+            if search_budget <= 0:
+                break  # remaining calls would be hard-blocked anyway
+            search_budget -= 1
+        if tool_call["id"] in state.prefetched_tool_results:
+            continue  # already executed mid-stream
+        candidates.append((tool_call["id"], tool_name, tool_args))
+
+    if len(candidates) < 2:
+        return  # nothing to parallelize
+
+    if state.verbose:
+        print(f"   ⚡ Prefetching {len(candidates)} tool calls concurrently")
+    with ThreadPoolExecutor(max_workers=min(len(candidates), max_workers)) as pool:
+        futures: Dict[str, Any] = {}
+        seen: Dict[tuple, Any] = {}
+        for tc_id, name, args in candidates:
+            try:
+                dedupe_key = (name, json.dumps(args, sort_keys=True, default=str))
+            except (TypeError, ValueError):
+                dedupe_key = (name, tc_id)  # unhashable args — run it alone
+            fut = seen.get(dedupe_key)
+            if fut is None:
+                fut = pool.submit(_run_prefetch_call, state, name, args)
+                seen[dedupe_key] = fut
+            futures[tc_id] = fut
+        for tc_id, fut in futures.items():
+            state.prefetched_tool_results[tc_id] = fut.result()
+
+
+def _prefetch_research_spawns(state: AgentState, parsed_calls: List[tuple]) -> None:
+    """Run sibling conduct_research dispatches concurrently (root only).
+
+    Sub-agent episodes are dominated by LLM and sandbox round-trips, so
+    when the orchestrator fans out K independent research tasks in one
+    turn the wall clock is roughly max(durations) instead of the sum.
+    Results land in ``state.prefetched_tool_results`` exactly like the
+    generic prefetch above; handle_conduct_research consumes them in the
+    original order, keeping message ordering and all sequential state
+    mutation (findings, memory, research log) unchanged.  When a causal
+    chain is active the tasks are *not* independent — each step's gate
+    depends on earlier resolutions — so the sequential path is kept.
+    """
+    if state.depth != 0 or getattr(_cfg, "MAX_CONCURRENT_SPAWNS", 4) <= 1:
+        return
+    if state.chain_plan is not None and state.chain_plan.has_chain:
+        return
+
+    candidates = []
+    for tool_call, tool_name, tool_args, args_were_malformed in parsed_calls:
+        if tool_name != "conduct_research" or args_were_malformed:
+            continue
+        task = str(tool_args.get("task", ""))
+        if not task or tool_call["id"] in state.prefetched_tool_results:
+            continue
+        # The prior-research dedup note reads episode state, so resolve
+        # it here on the main thread; the handler skips its own lookup
+        # for prefetched results.
+        prior_note = _find_similar_prior_research(state, task)
+        if prior_note:
+            existing_ctx = tool_args.get("context", "") or ""
+            tool_args = {**tool_args, "context": (existing_ctx + "\n\n" + prior_note).strip()}
+        candidates.append((tool_call["id"], tool_args))
+
+    if len(candidates) < 2:
+        return  # nothing to parallelize
+
+    if state.verbose:
+        print(f"   ⚡ Running {len(candidates)} research sub-agents concurrently")
+    futures = {
+        tc_id: _SPAWN_POOL.submit(_run_prefetch_call, state, "spawn_agent", args)
+        for tc_id, args in candidates
+    }
+    for tc_id, fut in futures.items():
+        state.prefetched_tool_results[tc_id] = fut.result()
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # POST-TURN PROCESSING  (auto-reflection, degeneration check)
 # ═══════════════════════════════════════════════════════════════════════
@@ -734,7 +1289,7 @@ def _post_turn(state: AgentState, turn_record: TurnRecord, final_answer_result:
                         _search_summaries.append(f"  [{tc.tool_name}]: {_out_preview}")
             _summary_block = "\n".join(_search_summaries[:3])
             state.messages.append({
-                "role": "system",
+                "role": ROLE_SYSTEM,
                 "content": (
                     "\U0001f50d REFLECT before your next action. Call think(thought='...') to assess:\n"
                     "  - What key information did you just find?\n"
@@ -754,16 +1309,17 @@ def _post_turn(state: AgentState, turn_record: TurnRecord, final_answer_result:
 
 def _handle_no_tool_calls(
     state: AgentState,
-    assistant_message: dict,
+    final_content: str,
     turn_record: TurnRecord,
     turn_start: float,
 ) -> Optional[Dict[str, Any]]:
     """Handle a response with no tool calls (shouldn't happen with required).
 
-    Returns a finalized dict if we should terminate, or None to continue.
+    final_content is the already-coalesced assistant content from the
+    turn loop. Returns a finalized dict if we should terminate, or None
+    to continue.
     """
     state.consecutive_no_tool_count += 1
-    final_content = assistant_message.get("content", "") or ""
 
     # ── Auto-draft capture (root only) ───────────────────────────────
     if state.depth == 0 and len(final_content.strip()) > 200 and state.draft_path:
@@ -794,20 +1350,20 @@ def _handle_no_tool_calls(
             _, latest_draft = state.draft_versions[-1]
             if state.verbose:
                 print(f"\u26a0\ufe0f  Model degenerated at root \u2014 using draft v{len(state.draft_versions)}")
-            turn_record.duration_s = round(time.time() - turn_start, 3)
+            turn_record.duration_s = round(time.perf_counter() - turn_start, 3)
             state.episode.turns.append(turn_record)
             return _finalize(state, latest_draft)
         elif len(final_content.strip()) > 200:
             if state.verbose:
                 print(f"\u26a0\ufe0f  Model produced text without tool calls {state.consecutive_no_tool_count}x \u2014 accepting as final answer")
-            turn_record.duration_s = round(time.time() - turn_start, 3)
+            turn_record.duration_s = round(time.perf_counter() - turn_start, 3)
             state.episode.turns.append(turn_record)
             return _finalize(state, final_content)
         else:
             if state.verbose:
                 print(f"\u26a0\ufe0f  Model degenerated ({state.consecutive_no_tool_count}x no tool calls) \u2014 breaking to synthesis")
             state.degenerated = True
-            turn_record.duration_s = round(time.time() - turn_start, 3)
+            turn_record.duration_s = round(time.perf_counter() - turn_start, 3)
             state.episode.turns.append(turn_record)
             return None  # signal: break out of turn loop
     else:
@@ -845,8 +1401,8 @@ def _handle_no_tool_calls(
                 nudge = (
                     "Your response was empty. Call a research tool or final_answer."
                 )
-        state.messages.append({"role": "user", "content": nudge})
-        turn_record.duration_s = round(time.time() - turn_start, 3)
+        state.messages.append({"role": ROLE_USER, "content": nudge})
+        turn_record.duration_s = round(time.perf_counter() - turn_start, 3)
         state.episode.turns.append(turn_record)
         return None  # continue
 
@@ -915,7 +1471,7 @@ def _run_synthesis(state: AgentState) -> Dict[str, Any]:
 
     if not state.degenerated:
         state.messages.append({
-            "role": "user",
+            "role": ROLE_USER,
             "content": (
                 "You have run out of turns. Call final_answer NOW with your best "
                 "response based on everything gathered so far.\n\n"
@@ -937,9 +1493,9 @@ def _run_synthesis(state: AgentState) -> Dict[str, Any]:
     # Try synthesis up to 2 times (skipped when degenerated)
     for synth_attempt in range(0 if state.degenerated else 2):
         try:
-            synth_response = call_api(state, synth_max_tokens, tools_override=[_FINAL_ANSWER_SCHEMA])
-            if synth_response.status_code == 200:
-                synth_result = synth_response.json()
+            synth_status, synth_result = _chat_completion(
+                state, synth_max_tokens, tools_override=[_FINAL_ANSWER_SCHEMA])
+            if synth_status == 200:
                 synth_choices = synth_result.get("choices")
                 if synth_choices and isinstance(synth_choices, list) and len(synth_choices) > 0:
                     synth_msg = synth_choices[0].get("message", {})
@@ -988,9 +1544,9 @@ def _run_synthesis(state: AgentState) -> Dict[str, Any]:
                         print(f"\u274c Synthesis attempt {synth_attempt + 1} returned no choices: "
                               f"{str(synth_result)[:200]}")
             else:
-                error_msg = str(synth_response.json().get("error", {}).get("message", ""))
+                error_msg = str(synth_result.get("error", {}).get("message", ""))
                 if "max_tokens" in error_msg or "input tokens" in error_msg:
-                    match = re.search(r'has (\d+) input tokens', error_msg)
+                    match = _INPUT_TOKENS_RE.search(error_msg)
                     if match:
                         input_tokens = int(match.group(1))
                         synth_max_tokens = max(
@@ -1000,7 +1556,7 @@ def _run_synthesis(state: AgentState) -> Dict[str, Any]:
                             print(f"\u26a0\ufe0f  Synthesis context overflow, retrying with {synth_max_tokens} max_tokens")
                         continue
                 if state.verbose:
-                    print(f"\u274c Synthesis turn API error: {synth_response.status_code}")
+                    print(f"\u274c Synthesis turn API error: {synth_status}")
         except Exception as e:
             if state.verbose:
                 print(f"\u274c Synthesis attempt {synth_attempt + 1} failed: {e}")
@@ -1096,7 +1652,11 @@ def _run_synthesis(state: AgentState) -> Dict[str, Any]:
                 print(f"\u274c Synthesis sub-agent failed: {e}")
 
     # ── Absolute fallback ─────────────────────────────────────────────
-    final_content = _build_fallback_response(state.messages, findings=state.findings)
+    final_content = _build_fallback_response(
+        state.messages,
+        findings=state.findings,
+        last_assistant_content=state.last_assistant_content,
+    )
 
     if state.verbose:
         if final_content:
@@ -1119,6 +1679,19 @@ def run_agent_loop(state: AgentState) -> Dict[str, Any]:
     create_state(), then passes it here.
     """
 
+    # ── Live trace viewer (root only) ─────────────────────────────────
+    if state.depth == 0 and getattr(_cfg, "LIVE_TRACE", False):
+        from .live_trace import LiveTraceServer  # lazy: pulls in http.server
+        try:
+            state.live_server = LiveTraceServer(state.episode)
+            url = state.live_server.start()
+            if state.verbose:
+                print(f"\U0001f4e1 Live trace: {url}")
+        except Exception as e:
+            state.live_server = None
+            if state.verbose:
+                print(f"\u26a0\ufe0f  Live trace server failed to start: {e}")
+
     while True:
         # ── Turn limit ────────────────────────────────────────────────
         if state.turn_length is not None and state.turn >= state.turn_length:
@@ -1127,11 +1700,11 @@ def run_agent_loop(state: AgentState) -> Dict[str, Any]:
             break
 
         state.turn += 1
-        turn_start = time.time()
+        turn_start = time.perf_counter()
         if state.verbose:
-            print(f"\n{'─' * 70}")
-            print(f"TURN {state.turn}" + (f" / {state.turn_length}" if state.turn_length else " (unlimited)"))
-            print(f"{'─' * 70}")
+            _rule = "─" * 70
+            _label = f"TURN {state.turn}" + (f" / {state.turn_length}" if state.turn_length else " (unlimited)")
+            sys.stdout.write(f"\n{_rule}\n{_label}\n{_rule}\n")
 
         # ── Token budget estimation ───────────────────────────────────
         approx_input_tokens = sum(len(str(m.get("content", ""))) for m in state.messages) // 4
@@ -1145,25 +1718,23 @@ def run_agent_loop(state: AgentState) -> Dict[str, Any]:
         tools_for_turn = _inject_pre_turn(state)
 
         # ── API call ──────────────────────────────────────────────────
-        response = call_api(state, effective_max_tokens, tools_override=tools_for_turn)
-        result = response.json()
+        status_code, result = _chat_completion(state, effective_max_tokens, tools_override=tools_for_turn)
 
         # ── Error handling ────────────────────────────────────────────
-        if response.status_code != 200:
+        if status_code != 200:
             error_msg = str(result.get("error", {}).get("message", ""))
 
             # Context overflow — retry with reduced max_tokens
             if "max_tokens" in error_msg or "max_completion_tokens" in error_msg:
-                match = re.search(r'has (\d+) input tokens', error_msg)
+                match = _INPUT_TOKENS_RE.search(error_msg)
                 if match:
                     input_tokens = int(match.group(1))
                     effective_max_tokens = state.context_window - input_tokens - _cfg.TOKEN_SAFETY_MARGIN
                     if effective_max_tokens >= 1:
                         if state.verbose:
                             print(f"\u26a0\ufe0f  max_tokens too large, retrying with {effective_max_tokens}")
-                        response = call_api(state, effective_max_tokens, tools_override=tools_for_turn)
-                        result = response.json()
-                        if response.status_code != 200:
+                        status_code, result = _chat_completion(state, effective_max_tokens, tools_override=tools_for_turn)
+                        if status_code != 200:
                             if state.verbose:
                                 print(f"\u274c API Error: {result}")
                             return _finalize(state, f"Error: {result}")
@@ -1185,7 +1756,7 @@ def run_agent_loop(state: AgentState) -> Dict[str, Any]:
                 if state.verbose:
                     print(f"\u26a0\ufe0f  vLLM parser error (recoverable): {error_msg[:150]}")
                 state.messages.append({
-                    "role": "user",
+                    "role": ROLE_USER,
                     "content": (
                         "Your previous response could not be parsed. "
                         "Call your tool again with correct formatting. "
@@ -1200,7 +1771,7 @@ def run_agent_loop(state: AgentState) -> Dict[str, Any]:
                     completion_tokens=0,
                     total_tokens=0,
                 )
-                turn_record.duration_s = round(time.time() - turn_start, 3)
+                turn_record.duration_s = round(time.perf_counter() - turn_start, 3)
                 state.episode.turns.append(turn_record)
                 continue
 
@@ -1215,7 +1786,7 @@ def run_agent_loop(state: AgentState) -> Dict[str, Any]:
             if state.verbose:
                 print(f"\u26a0\ufe0f  vLLM returned 200 with error body: {str(err_detail)[:200]}")
             state.messages.append({
-                "role": "user",
+                "role": ROLE_USER,
                 "content": (
                     "The server encountered an internal error processing your last response. "
                     "Please try your tool call again. Use a simpler approach if possible."
@@ -1227,7 +1798,7 @@ def run_agent_loop(state: AgentState) -> Dict[str, Any]:
                 raw_assistant_message={"error": str(err_detail)},
                 prompt_tokens=0, completion_tokens=0, total_tokens=0,
             )
-            turn_record.duration_s = round(time.time() - turn_start, 3)
+            turn_record.duration_s = round(time.perf_counter() - turn_start, 3)
             state.episode.turns.append(turn_record)
             continue
 
@@ -1247,19 +1818,62 @@ def run_agent_loop(state: AgentState) -> Dict[str, Any]:
 
         usage = result.get("usage", {})
 
+        # Normalize once: content/tool_calls are probed many times below
+        # (empty-response guard, sanitize, turn record, branch split) —
+        # coalesce the Optional fields here instead of at every site.
+        assistant_content = assistant_message.get("content") or ""
+        assistant_tool_calls = assistant_message.get("tool_calls") or []
+
+        # ── Degenerate empty-response guard ───────────────────────────
+        # Empty content + zero tool_calls usually means max_tokens ran
+        # out mid-thinking.  For finish_reason="length", retry once with
+        # a doubled (still budget-capped) allowance rather than burning
+        # a turn on nudging; either way the empty message stays out of
+        # the history so it isn't re-serialized on every later turn.
+        _empty_response = not assistant_tool_calls and not assistant_content.strip()
+        if _empty_response and choices[0].get("finish_reason") == "length":
+            _budget_cap = max(state.context_window - approx_input_tokens - _cfg.TOKEN_SAFETY_MARGIN, 256)
+            retry_tokens = min(effective_max_tokens * 2, _budget_cap)
+            if retry_tokens > effective_max_tokens:
+                if state.verbose:
+                    print(f"⚠️  Empty response (finish_reason=length) — retrying once with {retry_tokens} max_tokens")
+                status_code, result = _chat_completion(state, retry_tokens, tools_override=tools_for_turn)
+                _retry_choices = result.get("choices") or [] if status_code == 200 else []
+                if _retry_choices and _retry_choices[0].get("message"):
+                    choices = _retry_choices
+                    assistant_message = choices[0]["message"]
+                    usage = result.get("usage", {})
+                    assistant_content = assistant_message.get("content") or ""
+                    assistant_tool_calls = assistant_message.get("tool_calls") or []
+                    _empty_response = not assistant_tool_calls and not assistant_content.strip()
+
         # ── Sanitize assistant message ────────────────────────────────
-        clean_msg = {
-            "role": assistant_message["role"],
-            "content": assistant_message.get("content") or "",
-        }
-        if assistant_message.get("tool_calls"):
-            clean_msg["tool_calls"] = assistant_message["tool_calls"]
-        state.messages.append(clean_msg)
+        # The raw API message often carries extras (reasoning_content,
+        # refusal, null tool_calls) that would be re-serialized on every
+        # later turn.  When it's already in clean Message shape — the
+        # common case — append it as-is instead of copying.
+        if not _empty_response:
+            _raw_keys = assistant_message.keys()
+            if (_raw_keys <= _MESSAGE_KEYS
+                    and isinstance(assistant_message.get("content"), str)
+                    and ("tool_calls" not in _raw_keys or assistant_tool_calls)):
+                clean_msg: Message = assistant_message
+            else:
+                clean_msg = {
+                    "role": assistant_message["role"],
+                    "content": assistant_content,
+                }
+                if assistant_tool_calls:
+                    clean_msg["tool_calls"] = assistant_tool_calls
+            state.messages.append(clean_msg)
+            if assistant_content:
+                state.last_assistant_content = assistant_content
 
         # ── Build turn record ─────────────────────────────────────────
         turn_record = TurnRecord(
             turn_number=state.turn,
-            assistant_content=assistant_message.get("content"),
+            assistant_content=assistant_message.get("content"),  # None preserved for the trace
+
             raw_assistant_message=assistant_message,
             prompt_tokens=usage.get("prompt_tokens", 0),
             completion_tokens=usage.get("completion_tokens", 0),
@@ -1267,9 +1881,9 @@ def run_agent_loop(state: AgentState) -> Dict[str, Any]:
         )
 
         # ── No tool calls → nudge / degeneration ─────────────────────
-        tool_calls_in_msg = assistant_message.get("tool_calls") or []
+        tool_calls_in_msg = assistant_tool_calls
         if not tool_calls_in_msg:
-            result_dict = _handle_no_tool_calls(state, assistant_message, turn_record, turn_start)
+            result_dict = _handle_no_tool_calls(state, assistant_content, turn_record, turn_start)
             if result_dict is not None:
                 return result_dict
             if state.degenerated:
@@ -1279,12 +1893,17 @@ def run_agent_loop(state: AgentState) -> Dict[str, Any]:
             state.consecutive_no_tool_count = 0
 
         state.total_tool_calls += len(tool_calls_in_msg)
-        if state.verbose:
-            print(f"\U0001f527 Tool calls: {len(tool_calls_in_msg)}")
 
-        # ── Process each tool call ────────────────────────────────────
-        final_answer_result: Optional[str] = None
-        for i, tool_call in enumerate(tool_calls_in_msg, 1):
+        # ── Parse all tool calls up front ─────────────────────────────
+        # Parsing first (instead of inside the execution loop) lets the
+        # prefetch step below run independent I/O-bound calls
+        # concurrently while handlers still consume them in order.
+        # Verbose output for this phase is buffered into parse_log and
+        # flushed as one stdout write — per-call print() adds up when a
+        # turn carries many tool calls.
+        parse_log: List[str] = [f"\U0001f527 Tool calls: {len(tool_calls_in_msg)}"]
+        parsed_calls: List[tuple] = []
+        for tool_call in tool_calls_in_msg:
             tool_name = tool_call["function"]["name"]
             if "<|" in tool_name:
                 tool_name = tool_name.split("<|")[0]
@@ -1293,12 +1912,17 @@ def run_agent_loop(state: AgentState) -> Dict[str, Any]:
             raw_tool_name = tool_name
             tool_name = _sanitize_tool_name(tool_name, state)
             if tool_name != raw_tool_name and state.verbose:
-                print(f"   🔧 Sanitized tool name: '{raw_tool_name}' → '{tool_name}'")
+                parse_log.append(f"   🔧 Sanitized tool name: '{raw_tool_name}' → '{tool_name}'")
 
             raw_args = tool_call["function"].get("arguments", "")
             args_were_malformed = False
+            if isinstance(raw_args, dict):
+                # Some backends hand back structured arguments already —
+                # skip the decode (and the whole recovery ladder below).
+                parsed_calls.append((tool_call, tool_name, raw_args, False))
+                continue
             try:
-                tool_args = json.loads(raw_args) if raw_args else {}
+                tool_args = fast_json_loads(raw_args) if raw_args else {}
             except json.JSONDecodeError:
                 args_were_malformed = True
                 # ── General sanitizer: strip common model noise ───────
@@ -1306,27 +1930,38 @@ def run_agent_loop(state: AgentState) -> Dict[str, Any]:
                 if _sanitized is not None:
                     tool_args = _sanitized
                     if state.verbose:
-                        print(f"   \U0001f527 Sanitized malformed args for {tool_name} "
-                              f"({len(raw_args)} raw chars → {len(tool_args)} keys)")
+                        parse_log.append(f"   \U0001f527 Sanitized malformed args for {tool_name} "
+                                         f"({len(raw_args)} raw chars → {len(tool_args)} keys)")
                 elif tool_name in ("final_answer", "refine_draft") and raw_args:
                     _recovered = _recover_final_answer_from_raw(raw_args)
                     if _recovered:
                         _param = "answer" if tool_name == "final_answer" else "content"
                         tool_args = {_param: _recovered}
                         if state.verbose:
-                            print(f"   \U0001f527 Recovered {tool_name} from malformed JSON ({len(_recovered)} chars)")
+                            parse_log.append(f"   \U0001f527 Recovered {tool_name} from malformed JSON ({len(_recovered)} chars)")
                     else:
                         tool_args = {}
                         if state.verbose:
-                            print(f"   \u26a0\ufe0f  Malformed tool arguments for {tool_name}, could not recover")
+                            parse_log.append(f"   \u26a0\ufe0f  Malformed tool arguments for {tool_name}, could not recover")
                 else:
                     tool_args = {}
                     if state.verbose:
-                        print(f"   \u26a0\ufe0f  Malformed JSON for {tool_name}: {raw_args[:100]}")
+                        parse_log.append(f"   \u26a0\ufe0f  Malformed JSON for {tool_name}: {raw_args[:100]}")
+            parsed_calls.append((tool_call, tool_name, tool_args, args_were_malformed))
 
+        if state.verbose:
+            sys.stdout.write("\n".join(parse_log) + "\n")
+
+        # \u2500\u2500 Prefetch independent I/O-bound calls concurrently \u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500
+        _prefetch_tool_outputs(state, parsed_calls)
+        _prefetch_research_spawns(state, parsed_calls)
+
+        # \u2500\u2500 Process each tool call \u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500
+        final_answer_result: Optional[str] = None
+        for i, (tool_call, tool_name, tool_args, args_were_malformed) in enumerate(parsed_calls, 1):
             if state.verbose:
                 args_preview = str(tool_args)[:100]
-                print(f"   [{i}/{len(tool_calls_in_msg)}] {tool_name}({args_preview})")
+                print(f"   [{i}/{len(parsed_calls)}] {tool_name}({args_preview})")
 
             # ── Root tool scope enforcement ───────────────────────────
             # Block final_answer at root — must use research_complete.
@@ -1340,7 +1975,7 @@ def run_agent_loop(state: AgentState) -> Dict[str, Any]:
                     "quality review. Do NOT call final_answer again."
                 )
                 state.messages.append({
-                    "role": "tool",
+                    "role": ROLE_TOOL,
                     "tool_call_id": tool_call["id"],
                     "content": error_msg,
                 })
@@ -1368,7 +2003,7 @@ def run_agent_loop(state: AgentState) -> Dict[str, Any]:
                     "and other research tools on your behalf."
                 )
                 state.messages.append({
-                    "role": "tool",
+                    "role": ROLE_TOOL,
                     "tool_call_id": tool_call["id"],
                     "content": error_msg,
                 })
@@ -1395,7 +2030,7 @@ def run_agent_loop(state: AgentState) -> Dict[str, Any]:
                     "your task, then call final_answer with your results."
                 )
                 state.messages.append({
-                    "role": "tool",
+                    "role": ROLE_TOOL,
                     "tool_call_id": tool_call["id"],
                     "content": error_msg,
                 })
@@ -1425,7 +2060,7 @@ def run_agent_loop(state: AgentState) -> Dict[str, Any]:
                 break
 
         # ── Finalize turn ─────────────────────────────────────────────
-        turn_record.duration_s = round(time.time() - turn_start, 3)
+        turn_record.duration_s = round(time.perf_counter() - turn_start, 3)
         # Snapshot chain plan state so the HTML trace shows per-turn progress
         if (state.depth == 0 and state.chain_plan is not None
                 and state.chain_plan.has_chain):
@@ -1439,6 +2074,8 @@ def run_agent_loop(state: AgentState) -> Dict[str, Any]:
                 for s in state.chain_plan.chain_steps
             ]
         state.episode.turns.append(turn_record)
+        if state.live_server is not None:
+            state.live_server.push_turn(turn_record)
 
         # ── Post-turn processing ──────────────────────────────────────
         _post_turn(state, turn_record, final_answer_result)
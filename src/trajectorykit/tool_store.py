@@ -1,6 +1,6 @@
 import requests
 from typing import Any, Callable, Dict, List, Optional,Tuple, Union
-from .utils import SUPPORTED_LANGUAGES, API_TIMEOUT, MAX_RETRIES, INITIAL_RETRY_DELAY
+from .utils import SUPPORTED_LANGUAGES, API_TIMEOUT, MAX_RETRIES, INITIAL_RETRY_DELAY, TTLCache, _orjson, fast_json_loads, retry_delay
 from .config import MAX_RECURSION_DEPTH, SUB_AGENT_TURN_BUDGET, CONTEXT_WINDOW  # noqa: F811 — re-import ensures fresh values
 from . import config as _cfg
 from .tracing import EpisodeTrace  # adjust import path to wherever EpisodeTrace lives
@@ -9,9 +9,10 @@ import os
 import threading
 import time
 import traceback
-import uuid
+import itertools
 import json
 import random
+from collections import Counter, OrderedDict
 from datetime import datetime
 
 
@@ -28,6 +29,19 @@ logger = logging.getLogger(__name__)
 ToolReturn = Tuple[str, Optional[EpisodeTrace]]
 
 
+# ── Shared HTTP session (Serper / SerpAPI / Sandbox Fusion) ──────────
+# Module-level requests.get/post opened a fresh TCP (+TLS) connection
+# per search or sandbox call, so a hot agent loop paid a handshake for
+# every request to the same host. One process-wide Session reuses
+# urllib3's keep-alive pool across calls and threads; pool sizes cover
+# the prefetch workers plus concurrent sub-agents.
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.headers.update({"Accept": "application/json"})
+for _scheme in ("https://", "http://"):
+    _HTTP_SESSION.mount(_scheme, requests.adapters.HTTPAdapter(
+        pool_connections=16, pool_maxsize=64, max_retries=0))
+
+
 def cleanup_sandbox() -> bool:
     """Send a lightweight cleanup request to the sandbox to free /tmp.
 
@@ -37,7 +51,7 @@ def cleanup_sandbox() -> bool:
     """
     from .config import SANDBOX_FUSION_URL
     try:
-        resp = requests.post(
+        resp = _HTTP_SESSION.post(
             SANDBOX_FUSION_URL,
             json={
                 "code": (
@@ -78,10 +92,17 @@ DEFAULT_NUM_SEARCHES = 5
 SEARCH_TIMEOUT = 25   # seconds — complex quoted queries need more time
 MAX_SEARCH_RETRIES = 2
 
+# Keys resolved once at import (load_dotenv above has already run).
+# Per-call os.getenv re-did the environ lookup on every search, and the
+# static half of the SerpAPI params dict was rebuilt each time.
+_SERPER_API_KEY = os.getenv("SERPER_API_KEY", "")
+_SERP_API_KEY = os.getenv("SERP_API_KEY", "")
+_SERP_BASE_PARAMS = {"engine": "google", "api_key": _SERP_API_KEY, "hl": "en", "gl": "us"}
+
 
 def _search_serper(q: str, num_results: int = 5) -> str:
     """Google search via Serper.dev API."""
-    api_key = os.getenv("SERPER_API_KEY", "")
+    api_key = _SERPER_API_KEY
     if not api_key:
         return "Error: Serper API key not configured. Set SERPER_API_KEY environment variable."
 
@@ -101,22 +122,23 @@ def _search_serper(q: str, num_results: int = 5) -> str:
     for attempt in range(MAX_SEARCH_RETRIES + 1):
         try:
             logger.info(f"Serper search (attempt {attempt+1}): {q}")
-            response = requests.post(url, json=payload, headers=headers, timeout=SEARCH_TIMEOUT)
+            response = _HTTP_SESSION.post(url, json=payload, headers=headers, timeout=SEARCH_TIMEOUT)
             response.raise_for_status()
 
-            data = response.json()
+            data = fast_json_loads(response.content)
 
             # Serper returns organic results under "organic"
             results = data.get("organic", [])
             if not results:
                 return f"No results found for query: {q}"
 
-            formatted_results = f"Search Results for '{q}':\n\n"
-            for i, result in enumerate(results[:num_results], 1):
-                title = result.get("title", "No title")
-                link = result.get("link", "No link")
-                snippet = result.get("snippet", "No snippet")
-                formatted_results += f"{i}. {title}\n   URL: {link}\n   {snippet}\n\n"
+            # One join instead of growing the string per result.
+            formatted_results = f"Search Results for '{q}':\n\n" + "".join(
+                f"{i}. {result.get('title', 'No title')}\n"
+                f"   URL: {result.get('link', 'No link')}\n"
+                f"   {result.get('snippet', 'No snippet')}\n\n"
+                for i, result in enumerate(results[:num_results], 1)
+            )
 
             logger.info(f"Successfully retrieved {len(results[:num_results])} search results via Serper")
             return formatted_results
@@ -156,28 +178,20 @@ def _search_serper(q: str, num_results: int = 5) -> str:
 
 def _search_serpapi(q: str, num_results: int = 5) -> str:
     """Google search via SerpAPI.com."""
-    api_key = os.getenv("SERP_API_KEY", "")
-    if not api_key:
+    if not _SERP_API_KEY:
         return "Error: SerpAPI key not configured. Set SERP_API_KEY environment variable."
 
     url = "https://serpapi.com/search"
-    params = {
-        "engine": "google",
-        "q": q,
-        "api_key": api_key,
-        "num": min(num_results, 10),
-        "hl": "en",
-        "gl": "us",
-    }
+    params = {**_SERP_BASE_PARAMS, "q": q, "num": min(num_results, 10)}
 
     last_error = None
     for attempt in range(MAX_SEARCH_RETRIES + 1):
         try:
             logger.info(f"SerpAPI search (attempt {attempt+1}): {q}")
-            response = requests.get(url, params=params, timeout=SEARCH_TIMEOUT)
+            response = _HTTP_SESSION.get(url, params=params, timeout=SEARCH_TIMEOUT)
             response.raise_for_status()
 
-            data = response.json()
+            data = fast_json_loads(response.content)
 
             if "error" in data:
                 return f"Search API Error: {data.get('error', 'Unknown error')}"
@@ -186,12 +200,13 @@ def _search_serpapi(q: str, num_results: int = 5) -> str:
             if not results:
                 return f"No results found for query: {q}"
 
-            formatted_results = f"Search Results for '{q}':\n\n"
-            for i, result in enumerate(results[:num_results], 1):
-                title = result.get("title", "No title")
-                link = result.get("link", "No link")
-                snippet = result.get("snippet", "No snippet")
-                formatted_results += f"{i}. {title}\n   URL: {link}\n   {snippet}\n\n"
+            # One join instead of growing the string per result.
+            formatted_results = f"Search Results for '{q}':\n\n" + "".join(
+                f"{i}. {result.get('title', 'No title')}\n"
+                f"   URL: {result.get('link', 'No link')}\n"
+                f"   {result.get('snippet', 'No snippet')}\n\n"
+                for i, result in enumerate(results[:num_results], 1)
+            )
 
             logger.info(f"Successfully retrieved {len(results[:num_results])} search results via SerpAPI")
             return formatted_results
@@ -354,7 +369,7 @@ def _search_exa(q: str, num_results: int = 10) -> str:
                 logger.error(f"Exa: {error_msg}")
                 return error_msg
 
-            data = resp.json()
+            data = fast_json_loads(resp.content)
             results = data.get("results", [])
             if not results:
                 return f"No results found for query: {q}"
@@ -410,7 +425,109 @@ _SEARCH_BACKENDS = {
 }
 
 
+# ── Search result cache (TTL + stale-while-revalidate) ───────────────
+# Sub-agents fanned out over one topic repeat near-identical queries;
+# each duplicate costs a paid API credit and a network round-trip.
+# Fresh hits return immediately; entries in the stale window are served
+# as-is while one daemon thread revalidates in the background. Only
+# successful results are cached — error strings always retry live.
+_SEARCH_CACHE_TTL = 600          # seconds a result counts as fresh
+_SEARCH_STALE_WINDOW = 600       # serve-stale window past the TTL
+_search_cache = TTLCache(ttl_seconds=_SEARCH_CACHE_TTL, max_items=512)
+_search_refresh_inflight: set = set()
+_search_refresh_lock = threading.Lock()
+
+# ── Semantic near-match front ────────────────────────────────────────
+# Sibling sub-agents rarely repeat a query verbatim — "population of
+# Tokyo 2024" vs "Tokyo population 2024" miss the exact-match key while
+# wanting the same results. When the exact lookup misses, the query's
+# bag-of-words vector is compared against the last few cached queries
+# (pure-Python cosine; no embedding dependency) and a near-duplicate's
+# still-cached result is reused. The threshold is conservative so only
+# reorderings and minor rephrasings match, not different questions.
+_SEMANTIC_MATCH_THRESHOLD = 0.95
+_SEMANTIC_RECENT_MAX = 32
+_semantic_recent: "OrderedDict[str, Counter]" = OrderedDict()  # cache_key -> token counts
+
+
+def _query_tokens(q_norm: str) -> Counter:
+    return Counter(q_norm.split())
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    if len(b) < len(a):
+        a, b = b, a
+    dot = sum(count * b.get(token, 0) for token, count in a.items())
+    if not dot:
+        return 0.0
+    norm_a = sum(c * c for c in a.values()) ** 0.5
+    norm_b = sum(c * c for c in b.values()) ** 0.5
+    return dot / (norm_a * norm_b)
+
+
+def _remember_query(cache_key: str, q_norm: str) -> None:
+    with _search_refresh_lock:
+        _semantic_recent[cache_key] = _query_tokens(q_norm)
+        _semantic_recent.move_to_end(cache_key)
+        while len(_semantic_recent) > _SEMANTIC_RECENT_MAX:
+            _semantic_recent.popitem(last=False)
+
+
+def _semantic_lookup(cache_key: str, q_norm: str) -> Optional[str]:
+    """Return a cached result for a near-duplicate query, if any."""
+    suffix = cache_key[cache_key.rindex("|"):]  # same num_results only
+    tokens = _query_tokens(q_norm)
+    with _search_refresh_lock:
+        candidates = [(k, v) for k, v in _semantic_recent.items() if k != cache_key]
+    best_key, best_sim = None, _SEMANTIC_MATCH_THRESHOLD
+    for key, vec in reversed(candidates):
+        if not key.endswith(suffix):
+            continue
+        sim = _cosine(tokens, vec)
+        if sim >= best_sim:
+            best_key, best_sim = key, sim
+    if best_key is None:
+        return None
+    return _search_cache.get(best_key)
+
+
+def _refresh_search(cache_key: str, q: str, num_results: int) -> None:
+    try:
+        result = _search_web_live(q, num_results)
+        if not _is_search_error(result):
+            _search_cache.set(cache_key, result)
+    finally:
+        with _search_refresh_lock:
+            _search_refresh_inflight.discard(cache_key)
+
+
 def search_web(q: str, num_results: int = 5) -> str:
+    """Cached front of _search_web_live — see the cache notes above."""
+    cache_key = f"{q.strip().lower()}|{num_results}"
+    cached, fresh = _search_cache.get_with_staleness(cache_key, _SEARCH_STALE_WINDOW)
+    if cached is not None:
+        if not fresh:
+            with _search_refresh_lock:
+                refreshing = cache_key in _search_refresh_inflight
+                if not refreshing:
+                    _search_refresh_inflight.add(cache_key)
+            if not refreshing:
+                threading.Thread(
+                    target=_refresh_search, args=(cache_key, q, num_results),
+                    daemon=True, name="search-refresh",
+                ).start()
+        return cached
+    near = _semantic_lookup(cache_key, q.strip().lower())
+    if near is not None:
+        return near
+    result = _search_web_live(q, num_results)
+    if not _is_search_error(result):
+        _search_cache.set(cache_key, result)
+        _remember_query(cache_key, q.strip().lower())
+    return result
+
+
+def _search_web_live(q: str, num_results: int = 5) -> str:
     """
     Execute a web search and return structured results.
 
@@ -1050,7 +1167,7 @@ def _exa_contents_fallback(url: str, max_chars: int = 12000) -> str | None:
             logger.debug(f"Exa contents API returned {resp.status_code} for {url}")
             return None
 
-        data = resp.json()
+        data = fast_json_loads(resp.content)
         results = data.get("results", [])
         if not results:
             logger.debug(f"Exa contents API returned no results for {url}")
@@ -2135,7 +2252,7 @@ def wikipedia_lookup(title: str, section: str = "", max_chars: int = 12000) -> d
             "Accept": "application/json",
         }
         resp = httpx.get(api_url, params=params, headers=wiki_headers, timeout=15, follow_redirects=True)
-        data = resp.json()
+        data = fast_json_loads(resp.content)
 
         if "error" in data:
             return {"ok": False, "content": "", "title": title,
@@ -2246,7 +2363,7 @@ def fetch_cached(url: str, date: str = "", max_chars: int = 12000) -> dict:
         if date:
             params["timestamp"] = date
         resp = httpx.get(avail_url, params=params, timeout=15)
-        data = resp.json()
+        data = fast_json_loads(resp.content)
 
         snapshots = data.get("archived_snapshots", {})
         closest = snapshots.get("closest")
@@ -2299,6 +2416,35 @@ def fetch_cached(url: str, date: str = "", max_chars: int = 12000) -> dict:
                 "reason": f"{type(e).__name__}: {e}"}
 
 
+# ── Sub-agent trajectory cache ────────────────────────────────────────
+# Repeated spawns with an identical (task, context, model, turn budget)
+# re-run a whole sub-agent episode to reproduce a result that is already
+# known. When agent.spawn_trajectory_cache is enabled, the finished
+# (output, child_trace) pair is memoized in process and the second spawn
+# returns immediately. The replayed child trace still rides on the
+# parent's ToolCallRecord, so saved traces and the live viewer render it
+# exactly as if the sub-agent had run. Off by default: only enable for
+# workloads whose subtasks are idempotent.
+_spawn_cache: Dict[tuple, Tuple[str, Any]] = {}
+_spawn_cache_lock = threading.Lock()
+_SPAWN_CACHE_MAX = 64
+
+
+# dispatch is resolved lazily once — agent.py imports tool_store at
+# module load, so the reverse import only works after both modules
+# exist. The singleton guard avoids re-running the import machinery on
+# every spawn.
+_dispatch_fn = None
+
+
+def _get_dispatch():
+    global _dispatch_fn
+    if _dispatch_fn is None:
+        from .agent import dispatch
+        _dispatch_fn = dispatch
+    return _dispatch_fn
+
+
 def spawn_agent(
     task: str,
     context: Optional[str] = None,
@@ -2314,14 +2460,16 @@ def spawn_agent(
     Spawn a sub-agent to handle a subtask. Calls dispatch() recursively.
     Returns the sub-agent's final response as a string.
     """
-    from .agent import dispatch   # lazy import to avoid circular dependency
-    from .config import MAX_RECURSION_DEPTH, SUB_AGENT_TURN_BUDGET, get_model_profile, MODEL_NAME
+    dispatch = _get_dispatch()
 
-    resolved_model = model or MODEL_NAME
-    profile = get_model_profile(resolved_model)
+    # Config values read through the module object so a load_config()
+    # reload is still picked up without per-call re-imports.
+    MAX_RECURSION_DEPTH = _cfg.MAX_RECURSION_DEPTH
+    resolved_model = model or _cfg.MODEL_NAME
+    profile = _cfg.get_model_profile(resolved_model)
 
     if turn_length is None:
-        turn_length = SUB_AGENT_TURN_BUDGET
+        turn_length = _cfg.SUB_AGENT_TURN_BUDGET
     if max_tokens is None:
         max_tokens = profile["context_window"]
 
@@ -2333,13 +2481,24 @@ def spawn_agent(
             "depth": _depth + 1,
         }), None
 
-    full_input = f"{context}\n\nTASK: {task}" if context else task
-
     if _depth > 0:
         logger.info(f"Spawning sub-agent at depth {_depth}: {task[:80]}...")
 
+    cache_key = None
+    if getattr(_cfg, "SPAWN_TRAJECTORY_CACHE", False):
+        cache_key = (task, context, resolved_model, turn_length)
+        with _spawn_cache_lock:
+            hit = _spawn_cache.get(cache_key)
+        if hit is not None:
+            logger.info(f"Spawn trajectory cache hit: {task[:60]}...")
+            return hit
+
+    # Context goes through _context (its own message row) rather than
+    # being concatenated onto the task: sibling forks sharing a context
+    # blob then present an identical prefix to vLLM's prefix cache.
     result = dispatch(
-        user_input=full_input,
+        user_input=f"TASK: {task}" if context else task,
+        _context=context,
         turn_length=turn_length,
         verbose=False,           # sub-agents run silently
         max_tokens=profile["context_window"],
@@ -2360,8 +2519,47 @@ def spawn_agent(
         "depth": _depth + 1,
     })
 
+    if cache_key is not None and child_trace is not None:
+        with _spawn_cache_lock:
+            if len(_spawn_cache) >= _SPAWN_CACHE_MAX:
+                _spawn_cache.pop(next(iter(_spawn_cache)))  # drop oldest insertion
+            _spawn_cache[cache_key] = (output, child_trace)
+
     return output, child_trace
 
+# ── Sandbox result cache ──────────────────────────────────────────────
+# Sub-agents re-execute identical snippets across recursive spawns
+# (regenerating a plot, re-running a validator); each repeat paid the
+# full sandbox round trip. Deterministic submissions are memoized on a
+# hash of every input that affects the run. Code touching time, random,
+# datetime.now, uuid, entropy sources, stdin prompts, or the network
+# (requests/urllib/socket — responses change between runs) is never
+# cached.
+import re as _re_exec
+try:
+    import pybase64 as _pyb64  # SIMD base64 — optional, stdlib fallback below
+except ImportError:
+    import base64 as _pyb64
+# Log-correlation IDs only need per-process uniqueness; uuid4 burned an
+# os.urandom syscall plus hex formatting per call. next() on a count is
+# atomic under the GIL, so no lock is needed.
+_REQ_COUNTER = itertools.count(1)
+# Fenced code blocks in one C-level scan instead of chained split/strip
+# passes; the optional language tag replaces the first-line isalpha()
+# surgery.  An opening fence with no closing fence (truncated
+# generations) falls back to _OPEN_FENCE_RE: everything after the
+# fence line runs, as the old splitter did.
+_CODE_BLOCK_RE = _re_exec.compile(
+    r"```(?:(?P<lang>[A-Za-z0-9_+-]+)[ \t]*\n)?(?P<code>.*?)```", _re_exec.DOTALL)
+_OPEN_FENCE_RE = _re_exec.compile(r"```[A-Za-z0-9_+-]*[ \t]*\n?")
+_NONDETERMINISTIC_CODE_RE = _re_exec.compile(
+    r"\btime\.|\brandom\b|datetime\.now|\buuid\b|\binput\s*\("
+    r"|\brequests\b|\burllib\b|\bsocket\b|os\.urandom|\bsecrets\b")
+_exec_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_exec_cache_lock = threading.Lock()
+_EXEC_CACHE_MAX = 256
+
+
 def execute_code(
     code: Optional[str] = None,
     completion: Optional[str] = None,   # legacy alias for 'code'
@@ -2370,8 +2568,9 @@ def execute_code(
     run_timeout: int = 15,
     memory_limit_mb: int = 512,
     language: str = "python",
-    files: Optional[dict[str, str]] = None,      # filename -> base64 content
+    files: Optional[dict[str, Union[str, bytes]]] = None,  # filename -> base64 str or raw bytes
     fetch_files: Optional[list[str]] = None,      # list of filenames to return
+    no_cache: bool = False,                       # force a live sandbox run
 ) -> tuple[Optional[dict[str, Any]], Optional[str]]:
     
     from .config import SANDBOX_FUSION_URL
@@ -2381,23 +2580,30 @@ def execute_code(
     if not raw:
         return None, "ERROR: 'code' parameter is required"
 
-    extracted = raw
-    if "```python" in raw:
-        extracted = raw.split("```python")[-1].split("```")[0]
-    elif "```" in raw:
-        # Handle cases like ```\ncode\n```
-        parts = raw.split("```")
-        if len(parts) >= 2:
-            extracted = parts[1]
-            # Remove potential language specifier like 'python\n'
-            if "\n" in extracted:
-                first_line, rest = extracted.split("\n", 1)
-                if first_line.strip().isalpha():  # Simple check for language name
-                    extracted = rest
-    # If no code block markers, use raw input as-is (don't error)
-    code = extracted
+    # Last python-tagged block wins (matches the old split()[-1]
+    # behavior); otherwise the first fenced block; otherwise everything
+    # after an unterminated opening fence (truncated generations used to
+    # run their partial code, so keep doing that); otherwise the raw
+    # input as-is (don't error on missing markers).
+    blocks = list(_CODE_BLOCK_RE.finditer(raw))
+    if blocks:
+        python_blocks = [m for m in blocks if (m.group("lang") or "").lower() == "python"]
+        code = (python_blocks[-1] if python_blocks else blocks[0]).group("code")
+    else:
+        open_fence = _OPEN_FENCE_RE.search(raw)
+        code = raw[open_fence.end():] if open_fence else raw
     
-    request_id = str(uuid.uuid4())  # <-- Generate request_id internally
+    # Callers may hand over raw bytes; encode them to base64 exactly once
+    # here instead of making every producer pre-encode (and instead of
+    # round-tripping str -> bytes -> str on the way to the payload).
+    if files:
+        files = {
+            fname: _pyb64.b64encode(content).decode("ascii")
+            if isinstance(content, (bytes, bytearray)) else content
+            for fname, content in files.items()
+        }
+
+    request_id = f"{os.getpid()}-{next(_REQ_COUNTER):x}"  # log-correlation ID
     log_prefix = f"[Request ID: {request_id}] "  # <-- Create log prefix
 
     if language not in SUPPORTED_LANGUAGES:
@@ -2405,18 +2611,40 @@ def execute_code(
         logger.error(error_msg)
         return None, error_msg
 
-    payload = json.dumps(
-        {
-            "compile_timeout": compile_timeout,
-            "run_timeout": run_timeout,
-            "code": code,
-            "stdin": stdin,
-            "memory_limit_MB": memory_limit_mb,
-            "language": language,  # Use the passed language parameter
-            "files": files or {},
-            "fetch_files": fetch_files or [],
-        }
-    )
+    cache_key = None
+    if not no_cache and _NONDETERMINISTIC_CODE_RE.search(code) is None:
+        cache_key = _hashlib.blake2b(
+            json.dumps({
+                "code": code, "stdin": stdin, "language": language,
+                "files": files or {}, "fetch_files": fetch_files or [],
+            }, sort_keys=True).encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+        with _exec_cache_lock:
+            hit = _exec_cache.get(cache_key)
+            if hit is not None:
+                _exec_cache.move_to_end(cache_key)
+        if hit is not None:
+            logger.info(f"{log_prefix}Sandbox cache hit — skipping API call")
+            return hit
+
+    payload_obj = {
+        "compile_timeout": compile_timeout,
+        "run_timeout": run_timeout,
+        "code": code,
+        "stdin": stdin,
+        "memory_limit_MB": memory_limit_mb,
+        "language": language,  # Use the passed language parameter
+        "files": files or {},
+        "fetch_files": fetch_files or [],
+    }
+    # Serialized once, outside the retry loop (it is invariant across
+    # attempts). orjson escapes the base64-heavy files dict in C and
+    # returns bytes that requests sends as the body unchanged.
+    if _orjson is not None:
+        payload = _orjson.dumps(payload_obj)
+    else:
+        payload = json.dumps(payload_obj).encode("utf-8")
     headers = {"Content-Type": "application/json", "Accept": "application/json"}
     # Calculate a reasonable request timeout based on compile/run timeouts plus a buffer
     request_timeout = compile_timeout + run_timeout + API_TIMEOUT
@@ -2428,26 +2656,32 @@ def execute_code(
             logger.info(
                 f"{log_prefix}Attempt {attempt + 1}/{MAX_RETRIES}: Calling sandbox API at {SANDBOX_FUSION_URL}"
             )  # <-- Use internal log_prefix
-            response = requests.post(
+            response = _HTTP_SESSION.post(
                 SANDBOX_FUSION_URL,
                 headers=headers,
                 data=payload,
                 timeout=request_timeout,  # Use the calculated timeout
             )
 
-            # Check for Gateway Timeout (504) specifically for retrying
-            if response.status_code == 504:
+            # Retry transient gateway/overload statuses uniformly.
+            if response.status_code in (429, 502, 503, 504):
                 last_error = (
-                    f"{log_prefix}API Request Error: Gateway Timeout (504) on attempt "
+                    f"{log_prefix}API Request Error: HTTP {response.status_code} on attempt "
                     f"{attempt + 1}/{MAX_RETRIES}"
                 )  # <-- Use internal log_prefix
                 logger.warning(last_error)
                 if attempt < MAX_RETRIES - 1:  # Don't sleep after the last attempt
-                    # Calculate increasing delay (e.g., 1s, 2s, 4s, ...) or (1s, 2s, 3s, ...)
-                    # Simple linear increase: delay = INITIAL_RETRY_DELAY * (attempt + 1)
-                    # Exponential backoff: delay = INITIAL_RETRY_DELAY * (2 ** attempt)
-                    delay = INITIAL_RETRY_DELAY * (attempt + 1)  # Using linear increase for simplicity
-                    logger.info(f"{log_prefix}Retrying after {delay} seconds...")  # <-- Use internal log_prefix
+                    # Exponential backoff with jitter (retry_delay) so
+                    # parallel callers don't re-stampede the sandbox in
+                    # sync; a server-provided Retry-After wins.
+                    delay = min(retry_delay(attempt), 30)
+                    retry_after = response.headers.get("Retry-After")
+                    if retry_after:
+                        try:
+                            delay = min(float(retry_after), 60)
+                        except ValueError:
+                            pass
+                    logger.info(f"{log_prefix}Retrying after {delay:.1f} seconds...")  # <-- Use internal log_prefix
                     time.sleep(delay)
                 continue  # Go to the next retry attempt
 
@@ -2458,11 +2692,26 @@ def execute_code(
             logger.info(
                 f"{log_prefix}Sandbox API call successful on attempt {attempt + 1}"
             )  # <-- Use internal log_prefix
-            return response.json(), None
-
+            result = fast_json_loads(response.content)
+            if cache_key is not None:
+                with _exec_cache_lock:
+                    _exec_cache[cache_key] = (result, None)
+                    _exec_cache.move_to_end(cache_key)
+                    while len(_exec_cache) > _EXEC_CACHE_MAX:
+                        _exec_cache.popitem(last=False)
+            return result, None
+
+        except (requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout) as e:
+            # Transient transport failures are exactly what retries are
+            # for — back off and go again.
+            last_error = f"{log_prefix}API Request Error: {e}"  # <-- Use internal log_prefix
+            logger.warning(last_error)
+            if attempt < MAX_RETRIES - 1:
+                time.sleep(min(retry_delay(attempt), 30))
+            continue
         except requests.exceptions.RequestException as e:
             last_error = f"{log_prefix}API Request Error: {e}"  # <-- Use internal log_prefix
-            break  # Exit retry loop on non-504 request errors
+            break  # Exit retry loop on non-transient request errors
         except json.JSONDecodeError as e:
             raw_response_text = response.text if "response" in locals() else "N/A"
             last_error = f"{log_prefix}API Response JSON Decode Error: {e}"  # <-- Use internal log_prefix
@@ -2477,109 +2726,119 @@ def execute_code(
     # Ensure API call failure returns error message, leading to -1 in check_correctness
     return None, last_error.replace(log_prefix, "API Call Failed: ") if last_error else "API Call Failed after retries"
 
+def _format_sandbox_result(sandbox_result: dict, kwargs: dict) -> str:
+    """Format a parsed sandbox response into the tool-output string.
+
+    Pure function of its inputs — no I/O, no shared state — so it can be
+    called from any worker thread (the prefetch pools already run the
+    wrappers off the main thread) and unit-exercised without a sandbox.
+    """
+    status = sandbox_result.get("status", "Unknown")
+
+    # Check if execution succeeded
+    if status == "Success":
+        run_result = sandbox_result.get("run_result", {})
+        return_code = run_result.get("return_code", -1)
+        stdout = run_result.get("stdout", "")
+        stderr = run_result.get("stderr", "")
+        exec_time = run_result.get("execution_time", 0)
+
+        # Assembled as a parts list and joined once — repeated +=
+        # re-copied the accumulated string, which hurts when fetched
+        # base64 files run to megabytes.
+        parts = [f"Exit Code: {return_code}\n",
+                 f"Execution Time: {exec_time:.3f}s\n"]
+        if stdout:
+            parts.append(f"STDOUT:\n{stdout}")
+        if stderr:
+            parts.append(f"STDERR:\n{stderr}")
+
+        # Include any fetched files (base64-encoded) from the sandbox
+        fetched = sandbox_result.get("files", {})
+        if fetched:
+            parts.append("\nFETCHED FILES:\n")
+            parts.extend(f"--- {fname} (base64) ---\n{b64data}\n"
+                         for fname, b64data in fetched.items())
+
+        # Warn if files were requested but none came back
+        requested_files = kwargs.get("fetch_files", [])
+        if requested_files and not fetched:
+            parts.append(
+                f"\nWARNING: You requested fetch_files={requested_files} but no files were returned. "
+                "Make sure your code writes these files to the working directory "
+                "(e.g., use plt.savefig('output.png') instead of plt.show())."
+            )
+
+        output = "".join(parts)
+        return output if output.strip() else "Code executed successfully with no output"
+
+    # Execution failed — gather as much detail as possible
+    message = sandbox_result.get("message", "")
+    run_result = sandbox_result.get("run_result", {}) or {}
+    run_status = run_result.get("status", "")
+    stderr = run_result.get("stderr", "")
+    stdout = run_result.get("stdout", "")
+    return_code = run_result.get("return_code")
+    exec_time = run_result.get("execution_time", 0)
+
+    # Detect specific sandbox failure modes from run_result.status
+    if run_status == "TimeLimitExceeded":
+        run_timeout = kwargs.get("run_timeout", 5)
+        error_parts = [
+            f"ERROR: Time limit exceeded — your code ran for {exec_time:.1f}s and was killed (limit: {run_timeout}s).",
+            "Your code took too long to execute. Common causes:",
+            "- Infinite loops (while True) or very long loops",
+            "- Blocking calls (time.sleep, input()) or network waits",
+            "- Computationally expensive operations",
+            "FIX: Rewrite your code to complete within the time limit. Do NOT use infinite loops in the sandbox.",
+        ]
+        if stdout:
+            error_parts.append(f"Partial STDOUT before kill:\n{stdout}")
+    elif run_status == "MemoryLimitExceeded":
+        memory_limit = kwargs.get("memory_limit_mb", 128)
+        error_parts = [
+            f"ERROR: Memory limit exceeded (limit: {memory_limit}MB).",
+            "Your code used too much memory. Reduce data size or optimize memory usage.",
+        ]
+    else:
+        error_parts = [f"ERROR: Execution failed (status: {status})"]
+        if run_status:
+            error_parts.append(f"Run status: {run_status}")
+        if message:
+            error_parts.append(f"Message: {message}")
+        if return_code is not None:
+            error_parts.append(f"Return code: {return_code}")
+        if stderr:
+            error_parts.append(f"STDERR:\n{stderr}")
+        if stdout:
+            error_parts.append(f"STDOUT:\n{stdout}")
+        if not message and not stderr and not run_status:
+            error_parts.append("No error details provided by sandbox. Check your code for syntax errors or missing imports.")
+
+    return "\n".join(error_parts)
+
+
 def execute_code_wrapper(**kwargs):
     """Wrapper to call execute_code and format output for vLLM.
     Returns (output_str, None) — no child trace for code execution."""
     try:
         # execute_code returns a tuple: (result_dict, error_string)
         sandbox_result, error = execute_code(**kwargs)
-        
+
         # If there was an error
         if error:
             return f"ERROR: {error}", None
-        
+
         # If no result
         if sandbox_result is None:
             return "ERROR: No result returned from sandbox", None
-        
-        # Parse the sandbox result
+
         if isinstance(sandbox_result, dict):
-            status = sandbox_result.get("status", "Unknown")
-            
-            # Check if execution succeeded
-            if status == "Success":
-                run_result = sandbox_result.get("run_result", {})
-                return_code = run_result.get("return_code", -1)
-                stdout = run_result.get("stdout", "")
-                stderr = run_result.get("stderr", "")
-                exec_time = run_result.get("execution_time", 0)
-                
-                # Format output for vLLM
-                output = f"Exit Code: {return_code}\n"
-                output += f"Execution Time: {exec_time:.3f}s\n"
-                
-                if stdout:
-                    output += f"STDOUT:\n{stdout}"
-                if stderr:
-                    output += f"STDERR:\n{stderr}"
-                
-                # Include any fetched files (base64-encoded) from the sandbox
-                fetched = sandbox_result.get("files", {})
-                if fetched:
-                    output += "\nFETCHED FILES:\n"
-                    for fname, b64data in fetched.items():
-                        output += f"--- {fname} (base64) ---\n{b64data}\n"
-                
-                # Warn if files were requested but none came back
-                requested_files = kwargs.get("fetch_files", [])
-                if requested_files and not fetched:
-                    output += (
-                        f"\nWARNING: You requested fetch_files={requested_files} but no files were returned. "
-                        "Make sure your code writes these files to the working directory "
-                        "(e.g., use plt.savefig('output.png') instead of plt.show())."
-                    )
-                
-                result = output if output.strip() else "Code executed successfully with no output"
-                return result, None
-            else:
-                # Execution failed — gather as much detail as possible
-                message = sandbox_result.get("message", "")
-                run_result = sandbox_result.get("run_result", {}) or {}
-                run_status = run_result.get("status", "")
-                stderr = run_result.get("stderr", "")
-                stdout = run_result.get("stdout", "")
-                return_code = run_result.get("return_code")
-                exec_time = run_result.get("execution_time", 0)
-                
-                # Detect specific sandbox failure modes from run_result.status
-                if run_status == "TimeLimitExceeded":
-                    run_timeout = kwargs.get("run_timeout", 5)
-                    error_parts = [
-                        f"ERROR: Time limit exceeded — your code ran for {exec_time:.1f}s and was killed (limit: {run_timeout}s).",
-                        "Your code took too long to execute. Common causes:",
-                        "- Infinite loops (while True) or very long loops",
-                        "- Blocking calls (time.sleep, input()) or network waits",
-                        "- Computationally expensive operations",
-                        "FIX: Rewrite your code to complete within the time limit. Do NOT use infinite loops in the sandbox.",
-                    ]
-                    if stdout:
-                        error_parts.append(f"Partial STDOUT before kill:\n{stdout}")
-                elif run_status == "MemoryLimitExceeded":
-                    memory_limit = kwargs.get("memory_limit_mb", 128)
-                    error_parts = [
-                        f"ERROR: Memory limit exceeded (limit: {memory_limit}MB).",
-                        "Your code used too much memory. Reduce data size or optimize memory usage.",
-                    ]
-                else:
-                    error_parts = [f"ERROR: Execution failed (status: {status})"]
-                    if run_status:
-                        error_parts.append(f"Run status: {run_status}")
-                    if message:
-                        error_parts.append(f"Message: {message}")
-                    if return_code is not None:
-                        error_parts.append(f"Return code: {return_code}")
-                    if stderr:
-                        error_parts.append(f"STDERR:\n{stderr}")
-                    if stdout:
-                        error_parts.append(f"STDOUT:\n{stdout}")
-                    if not message and not stderr and not run_status:
-                        error_parts.append("No error details provided by sandbox. Check your code for syntax errors or missing imports.")
-                
-                return "\n".join(error_parts), None
-        
+            return _format_sandbox_result(sandbox_result, kwargs), None
+
         # Fallback
         return f"Unexpected result format: {str(sandbox_result)[:200]}", None
-        
+
     except Exception as e:
         return f"ERROR: {str(e)}", None
 
@@ -2653,11 +2912,10 @@ def spawn_agent_wrapper(_depth: int = 0, _model: Optional[str] = None, _reasonin
         elif memory_keys and not _memory_store:
             task += "\n\n(Note: memory_keys were requested but memory store is not available at this depth.)"
 
-        from .config import SUB_AGENT_TURN_BUDGET
         output, child_trace = spawn_agent(
             task=task,
             context=kwargs.get("context"),
-            turn_length=kwargs.get("turn_length", SUB_AGENT_TURN_BUDGET),
+            turn_length=kwargs.get("turn_length", _cfg.SUB_AGENT_TURN_BUDGET),
             max_tokens=kwargs.get("max_tokens"),
             temperature=kwargs.get("temperature"),
             model=_model,
@@ -2677,42 +2935,19 @@ def final_answer_wrapper(**kwargs):
 
 
 def search_available_tools_wrapper(**kwargs):
-    """Wrapper for search_available_tools. Returns (output, None)."""
-    try:
-        tool_name = kwargs.get("tool_name")
-        if tool_name:
-            # Return full schema for the requested tool
-            for tool in TOOLS:
-                if tool["function"]["name"] == tool_name:
-                    return json.dumps(tool, indent=2), None
-            return f"ERROR: No tool named '{tool_name}'. Call search_available_tools with no arguments to see all available tools.", None
-        else:
-            # Return compact signature + one-liner for each tool
-            summary = []
-            for tool in TOOLS:
-                func = tool["function"]
-                name = func["name"]
-                # Build a compact signature: name(param: type, param?: type=default, ...)
-                params = func.get("parameters", {}).get("properties", {})
-                required = set(func.get("parameters", {}).get("required", []))
-                parts = []
-                for pname, pschema in params.items():
-                    ptype = pschema.get("type", "any")
-                    default = pschema.get("default")
-                    if pname in required:
-                        parts.append(f"{pname}: {ptype}")
-                    elif default is not None:
-                        parts.append(f"{pname}?: {ptype}={default}")
-                    else:
-                        parts.append(f"{pname}?: {ptype}")
-                sig = ", ".join(parts)
-                # First sentence of description (split on '. ' to get a real sentence)
-                raw_desc = func["description"].replace('\n', ' ')
-                first_sentence = raw_desc.split('. ')[0].strip().rstrip('.')
-                summary.append(f"- {name}({sig})\n  {first_sentence}.")
-            return "Available tools:\n\n" + "\n\n".join(summary), None
-    except Exception as e:
-        return f"ERROR: {str(e)}", None
+    """Wrapper for search_available_tools. Returns (output, None).
+
+    Schemas are frozen at import, so both the per-tool JSON and the
+    full summary come from indexes precomputed at module bottom
+    (after TOOLS is sealed) — one dict lookup, no scan or re-dump.
+    """
+    tool_name = kwargs.get("tool_name")
+    if not tool_name:
+        return _TOOL_SUMMARY, None
+    schema = _TOOL_SCHEMA_JSON.get(tool_name)
+    if schema is not None:
+        return schema, None
+    return f"ERROR: No tool named '{tool_name}'. Call search_available_tools with no arguments to see all available tools.", None
 
 
 # ── Direct data-file download helper ──────────────────────────────────
@@ -3328,8 +3563,7 @@ def recall_memory_wrapper(_memory_store=None, **kwargs):
 
         # Query filter: grep matching lines
         if query:
-            q_lower = query.lower()
-            matching = [line for line in content.split("\n") if q_lower in line.lower()]
+            matching = _memory_store.grep(key, query) or []
             if not matching:
                 return f"No lines matching '{query}' in {key} ({len(content):,} chars total).", None
             filtered = "\n".join(matching)
@@ -3383,34 +3617,36 @@ def dispatch_tool_call(tool_name: str, tool_args: dict, _depth: int = 0, model:
             merged = {**_sandbox_files, **model_files}  # model files take precedence
             tool_args = {**tool_args, "files": merged}
         # Strip unknown kwargs the model may hallucinate (e.g. 'timeout')
-        _EXEC_VALID = {"code", "completion", "stdin", "compile_timeout", "run_timeout",
-                       "memory_limit_mb", "language", "files", "fetch_files"}
-        tool_args = {k: v for k, v in tool_args.items() if k in _EXEC_VALID}
+        tool_args = {k: v for k, v in tool_args.items() if k in _EXEC_VALID_ARGS}
         return execute_code_wrapper(**tool_args)
-    elif tool_name == "search_web":
-        return search_web_wrapper(**tool_args)
-    elif tool_name == "spawn_agent":
+    if tool_name == "spawn_agent":
         return spawn_agent_wrapper(_depth=_depth, _model=model, _reasoning_effort=reasoning_effort, _sandbox_files=_sandbox_files, _memory_store=_memory_store, **tool_args)
-    elif tool_name == "final_answer":
-        return final_answer_wrapper(**tool_args)
-    elif tool_name == "search_available_tools":
-        return search_available_tools_wrapper(**tool_args)
-    elif tool_name == "fetch_url":
-        return fetch_url_wrapper(**tool_args)
-    elif tool_name == "read_pdf":
-        return read_pdf_wrapper(**tool_args)
-    elif tool_name == "extract_tables":
-        return extract_tables_wrapper(**tool_args)
-    elif tool_name == "wikipedia_lookup":
-        return wikipedia_lookup_wrapper(**tool_args)
-    elif tool_name == "fetch_cached":
-        return fetch_cached_wrapper(**tool_args)
-    elif tool_name == "read_page":
-        return read_page_wrapper(**tool_args)
-    elif tool_name == "recall_memory":
+    if tool_name == "recall_memory":
         return recall_memory_wrapper(_memory_store=_memory_store, **tool_args)
-    else:
-        return f"ERROR: Unknown tool '{tool_name}'", None
+    fn = _DISPATCH_TABLE.get(tool_name)
+    if fn is not None:
+        return fn(**tool_args)
+    return f"ERROR: Unknown tool '{tool_name}'", None
+
+
+# Hot-path dispatch: one hash lookup instead of walking an if/elif
+# chain per tool call. execute_code / spawn_agent / recall_memory stay
+# as explicit branches above because they need injected kwargs.
+_EXEC_VALID_ARGS = frozenset({
+    "code", "completion", "stdin", "compile_timeout", "run_timeout",
+    "memory_limit_mb", "language", "files", "fetch_files",
+})
+_DISPATCH_TABLE = {
+    "search_web": search_web_wrapper,
+    "final_answer": final_answer_wrapper,
+    "search_available_tools": search_available_tools_wrapper,
+    "fetch_url": fetch_url_wrapper,
+    "read_pdf": read_pdf_wrapper,
+    "extract_tables": extract_tables_wrapper,
+    "wikipedia_lookup": wikipedia_lookup_wrapper,
+    "fetch_cached": fetch_cached_wrapper,
+    "read_page": read_page_wrapper,
+}
 
 # Define the tool schemas for vLLM
 TOOLS = [
@@ -3986,6 +4222,12 @@ TOOLS = [
     }
 ]
 
+# Frozen: the schema list is iterated and serialized, never mutated.
+# A stable tuple means the runner's pre-serialized tools-bytes cache
+# (runner._TOOLS_JSON_CACHE) keys on one identity for the process
+# lifetime, and accidental append/extend is caught at the call site.
+TOOLS = tuple(TOOLS)
+
 
 # ── Root-only tools ──────────────────────────────────────────────────────
 # These are the ONLY tools the root orchestrator sees.  They are virtual
@@ -4227,3 +4469,42 @@ ROOT_TOOLS = [
         }
     }
 ]
+
+ROOT_TOOLS = tuple(ROOT_TOOLS)  # frozen, same rationale as TOOLS
+
+
+# ── search_available_tools indexes ────────────────────────────────────
+# Built once here, after the schema tuples are sealed: name → schema,
+# name → pretty-printed JSON, and the full "list everything" summary.
+_TOOL_BY_NAME = {t["function"]["name"]: t for t in TOOLS}
+_TOOL_SCHEMA_JSON = {name: json.dumps(t, indent=2) for name, t in _TOOL_BY_NAME.items()}
+
+
+def _build_tool_summary() -> str:
+    """Compact signature + one-liner for each tool."""
+    summary = []
+    for tool in TOOLS:
+        func = tool["function"]
+        name = func["name"]
+        # Build a compact signature: name(param: type, param?: type=default, ...)
+        params = func.get("parameters", {}).get("properties", {})
+        required = set(func.get("parameters", {}).get("required", []))
+        parts = []
+        for pname, pschema in params.items():
+            ptype = pschema.get("type", "any")
+            default = pschema.get("default")
+            if pname in required:
+                parts.append(f"{pname}: {ptype}")
+            elif default is not None:
+                parts.append(f"{pname}?: {ptype}={default}")
+            else:
+                parts.append(f"{pname}?: {ptype}")
+        sig = ", ".join(parts)
+        # First sentence of description (split on '. ' to get a real sentence)
+        raw_desc = func["description"].replace('\n', ' ')
+        first_sentence = raw_desc.split('. ')[0].strip().rstrip('.')
+        summary.append(f"- {name}({sig})\n  {first_sentence}.")
+    return "Available tools:\n\n" + "\n\n".join(summary)
+
+
+_TOOL_SUMMARY = _build_tool_summary()
@@ -8,14 +8,65 @@ timing, and message history. Supports JSON serialization and pretty-printing.
 import json
 import os
 import re
+import sys
+import threading
 import time
 import uuid
 import html as html_mod
+import io
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field, asdict
+from functools import lru_cache
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from .config import TRACES_DIR
+from .utils import _orjson, fast_json_dumps
+
+
+# Process-wide pool for trace persistence: save() uses it to overlap the
+# JSON write with HTML rendering.  Two workers so a save_async episode
+# and a foreground save can each keep their JSON half moving.
+_SAVE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="trace-save")
+
+_TRACES_DIR_READY = False
+
+
+def _ensure_traces_dir() -> None:
+    """Create TRACES_DIR on first use; later saves skip the syscalls."""
+    global _TRACES_DIR_READY
+    if not _TRACES_DIR_READY:
+        os.makedirs(TRACES_DIR, exist_ok=True)
+        _TRACES_DIR_READY = True
+
+
+def _dumps_json_bytes(obj) -> bytes:
+    """Pretty-printed JSON bytes for a trace node (dataclass or dict).
+
+    orjson encodes dataclasses natively in Rust — one buffer, one
+    ``f.write`` — so the save path never materializes an intermediate
+    dict tree.  The stdlib fallback keeps the old walk.
+    """
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2, default=str)
+    return json.dumps(_serialize_tree(obj), indent=2, default=str).encode("utf-8")
+
+
+def _serialize_tree(obj):
+    """Recursively convert a trace tree (or any sub-node) to JSON-safe values."""
+    if isinstance(obj, (EpisodeTrace, TurnRecord, ToolCallRecord)):
+        # Skip underscore attributes — memo/bookkeeping state, not trace data.
+        return {
+            k: _serialize_tree(v)
+            for k, v in obj.__dict__.items()
+            if not k.startswith("_")
+        }
+    elif isinstance(obj, list):
+        return [_serialize_tree(item) for item in obj]
+    elif isinstance(obj, dict):
+        return {k: _serialize_tree(v) for k, v in obj.items()}
+    else:
+        return obj
 
 
 @dataclass
@@ -87,47 +138,148 @@ class EpisodeTrace:
     # Pre-research quality rubric (root only, generated before turn 1)
     rubric: Optional[str] = None
 
+    # Memo key for compute_recursive_stats (plain class attribute, not a
+    # dataclass field — never serialized).
+    _stats_cache_key = None
+
     def to_dict(self) -> Dict[str, Any]:
-        """Serialize the full trace tree to a dict (JSON-safe)."""
-        def _serialize(obj):
-            if isinstance(obj, EpisodeTrace):
-                d = {}
-                for k, v in obj.__dict__.items():
-                    d[k] = _serialize(v)
-                return d
-            elif isinstance(obj, (TurnRecord, ToolCallRecord)):
-                d = {}
-                for k, v in obj.__dict__.items():
-                    d[k] = _serialize(v)
-                return d
-            elif isinstance(obj, list):
-                return [_serialize(item) for item in obj]
-            elif isinstance(obj, dict):
-                return {k: _serialize(v) for k, v in obj.items()}
-            else:
-                return obj
-        return _serialize(self)
+        """Serialize the full trace tree to a dict (JSON-safe).
+
+        Round-trips through orjson when available: the Rust encoder
+        walks the dataclass tree natively, and even with the extra
+        parse that beats the per-node isinstance dispatch and dict
+        comprehensions of the pure-Python walk on large trees.  The
+        result is also fully JSON-safe (non-encodable values become
+        strings via ``default=str``), which is what the HTML renderer
+        wants anyway.
+        """
+        if _orjson is not None:
+            return _orjson.loads(_orjson.dumps(self, default=str))
+        return _serialize_tree(self)
 
     def save(self, path: Optional[str] = None) -> str:
         """Save trace to JSON and HTML files inside TRACES_DIR. Returns the JSON file path."""
         if path is None:
-            os.makedirs(TRACES_DIR, exist_ok=True)
+            _ensure_traces_dir()
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             path = os.path.join(TRACES_DIR, f"trace_{timestamp}_{self.trace_id}.json")
         else:
             # Ensure parent directory exists for custom paths too
             os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
-        with open(path, "w") as f:
-            json.dump(self.to_dict(), f, indent=2, default=str)
-        # Also emit an HTML version alongside the JSON
         html_path = path.replace(".json", ".html")
-        html_str = render_trace_html(self.to_dict())
-        with open(html_path, "w") as f:
-            f.write(html_str)
+
+        def _write_json_file():
+            with open(path, "wb") as f:
+                self._write_json(f)
+
+        # The JSON write goes to a pool worker while the HTML version —
+        # streamed into a buffered handle so the full page is never held
+        # in memory — renders on this thread: disk I/O and the orjson
+        # encodes release the GIL, so the two halves genuinely overlap.
+        # Keeping one half inline means a single save() never occupies
+        # two workers at once.
+        json_future = _SAVE_POOL.submit(_write_json_file)
+        try:
+            with open(html_path, "w", buffering=1 << 20) as f:
+                _stream_trace_html(self.to_dict(), f.write)
+        finally:
+            json_future.result()
         return html_path
 
+    def _write_json(self, f) -> None:
+        """Stream the trace JSON to *f* (binary) one turn at a time.
+
+        The turns array dominates a trace's size (it embeds every tool
+        output and child trace).  Serializing it turn-by-turn keeps peak
+        memory at roughly one turn instead of the whole tree held twice
+        (dict plus rendered string).  Each turn is encoded straight from
+        the dataclass — orjson walks dataclass fields natively, so the
+        Python-level ``_serialize_tree`` pass only runs on the stdlib
+        fallback.  Inner turn objects keep their own 2-space indentation
+        rather than being re-indented to nesting depth — the file stays
+        valid JSON either way.
+        """
+        header = {
+            k: v for k, v in self.__dict__.items()
+            if k != "turns" and not k.startswith("_")
+        }
+        head_json = _dumps_json_bytes(header)
+        # Drop the closing brace so the turns array can be spliced in.
+        f.write(head_json[: head_json.rfind(b"}")].rstrip())
+        f.write(b',\n  "turns": [')
+        for i, turn in enumerate(self.turns):
+            f.write(b",\n" if i else b"\n")
+            f.write(_dumps_json_bytes(turn))
+        f.write(b"\n  ]\n}")
+
+    def save_async(self, path: Optional[str] = None) -> tuple:
+        """Serialize and write the trace on a background thread.
+
+        Serializing + writing a large trace (JSON and HTML) can take
+        seconds; callers that still have console output to produce
+        (pretty_print) or the next question to start shouldn't wait on
+        it.  The destination path is resolved eagerly so callers can
+        report it immediately.
+
+        Returns (thread, html_path).  The thread is non-daemon so a
+        normally-exiting process finishes the write; join() it if you
+        need the files on disk before proceeding.
+        """
+        if path is None:
+            _ensure_traces_dir()
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(TRACES_DIR, f"trace_{timestamp}_{self.trace_id}.json")
+        t = threading.Thread(
+            target=self.save, args=(path,), name=f"trace-save-{self.trace_id}",
+        )
+        t.start()
+        return t, path.replace(".json", ".html")
+
+    def _stats_fingerprint(self) -> tuple:
+        """Cheap change marker for the stats memo.
+
+        Any growth that matters to the aggregates appends a turn or a
+        tool call (sub-agent traces are attached when their tool call
+        completes), so turn count plus the shape of the last turn is
+        enough to detect it.  A child that is still mid-flight can make
+        a parent's cached totals transiently stale, but the final
+        pretty_print/save always sees the bumped fingerprint.
+        """
+        last = self.turns[-1] if self.turns else None
+        return (
+            len(self.turns),
+            self.total_turns,
+            self.total_tool_calls,
+            len(last.tool_calls) if last else 0,
+            last.total_tokens if last else 0,
+        )
+
     def compute_recursive_stats(self):
-        """Walk the trace tree and compute aggregate stats."""
+        """Walk the trace tree and compute aggregate stats.
+
+        Memoized and iterative: stale nodes are collected depth-first
+        with an explicit stack, then aggregated in reverse (post-order)
+        so every parent sums already-fresh children.  Repeated calls on
+        an unchanged (sub-)tree — e.g. pretty_print followed by save on
+        the same episode — skip the walk entirely, and arbitrarily deep
+        sub-agent chains can't hit the recursion limit.
+        """
+        stale: List["EpisodeTrace"] = []
+        stack: List["EpisodeTrace"] = [self]
+        while stack:
+            node = stack.pop()
+            if node._stats_cache_key == node._stats_fingerprint():
+                continue  # whole subtree already aggregated
+            stale.append(node)
+            for turn in node.turns:
+                for tc in turn.tool_calls:
+                    if tc.child_trace is not None:
+                        stack.append(tc.child_trace)
+        for node in reversed(stale):
+            node._aggregate_stats()
+
+    def _aggregate_stats(self):
+        """Aggregate one node; children's recursive fields must be fresh."""
         self.total_tool_calls_recursive = self.total_tool_calls
         self.total_turns_recursive = self.total_turns
         self.total_sub_agents_spawned = 0
@@ -138,55 +290,65 @@ class EpisodeTrace:
         for turn in self.turns:
             for tc in turn.tool_calls:
                 if tc.child_trace is not None:
-                    self.total_sub_agents_spawned += 1
-                    tc.child_trace.compute_recursive_stats()
+                    self.total_sub_agents_spawned += 1 + tc.child_trace.total_sub_agents_spawned
                     self.total_tool_calls_recursive += tc.child_trace.total_tool_calls_recursive
                     self.total_turns_recursive += tc.child_trace.total_turns_recursive
-                    self.total_sub_agents_spawned += tc.child_trace.total_sub_agents_spawned
                     self.total_prompt_tokens += tc.child_trace.total_prompt_tokens
                     self.total_completion_tokens += tc.child_trace.total_completion_tokens
                     self.total_tokens += tc.child_trace.total_tokens
 
-    def pretty_print(self, indent: int = 0):
-        """Pretty-print the full trace tree."""
+        self._stats_cache_key = self._stats_fingerprint()
+
+    def pretty_print(self, indent: int = 0, _buf: Optional[list] = None):
+        """Pretty-print the full trace tree.
+
+        Lines are batched into a list threaded through the recursion and
+        flushed with a single ``sys.stdout.write`` at the top — one
+        write() per tree instead of one per line, which matters on
+        line-buffered terminals for deep traces.
+        """
+        flush = _buf is None
+        if flush:
+            _buf = []
+        out = _buf.append
         prefix = "  " * indent
         depth_label = f"[depth={self.depth}]" if self.depth > 0 else "[root]"
         agent_label = "🤖 Sub-Agent" if self.depth > 0 else "🏁 Agent"
 
-        print(f"{prefix}{'━' * 60}")
-        print(f"{prefix}{agent_label} {depth_label}  trace_id={self.trace_id}")
-        print(f"{prefix}  Input: {self.user_input[:100]}{'...' if len(self.user_input) > 100 else ''}")
-        print(f"{prefix}  Duration: {self.duration_s:.2f}s | Turns: {self.total_turns} | Tool calls: {self.total_tool_calls}")
-        print(f"{prefix}{'━' * 60}")
+        out(f"{prefix}{'━' * 60}")
+        out(f"{prefix}{agent_label} {depth_label}  trace_id={self.trace_id}")
+        out(f"{prefix}  Input: {self.user_input[:100]}{'...' if len(self.user_input) > 100 else ''}")
+        out(f"{prefix}  Duration: {self.duration_s:.2f}s | Turns: {self.total_turns} | Tool calls: {self.total_tool_calls}")
+        out(f"{prefix}{'━' * 60}")
 
         for turn in self.turns:
-            print(f"{prefix}  ┌─ Turn {turn.turn_number} ({turn.duration_s:.2f}s)")
+            out(f"{prefix}  ┌─ Turn {turn.turn_number} ({turn.duration_s:.2f}s)")
 
             if turn.tool_calls:
                 for tc in turn.tool_calls:
                     # Truncate args for display
-                    args_str = json.dumps(tc.tool_args, default=str)
+                    args_str = fast_json_dumps(tc.tool_args, default=str)
                     if len(args_str) > 120:
                         args_str = args_str[:120] + "..."
-                    print(f"{prefix}  │  🔧 {tc.tool_name}({args_str}) [{tc.duration_s:.2f}s]")
+                    out(f"{prefix}  │  🔧 {tc.tool_name}({args_str}) [{tc.duration_s:.2f}s]")
 
                     # Truncate output for display
                     out_preview = tc.output.replace("\n", "\\n")
                     if len(out_preview) > 150:
                         out_preview = out_preview[:150] + "..."
-                    print(f"{prefix}  │     → {out_preview}")
+                    out(f"{prefix}  │     → {out_preview}")
 
                     # Recurse into child trace
                     if tc.child_trace is not None:
-                        tc.child_trace.pretty_print(indent=indent + 3)
+                        tc.child_trace.pretty_print(indent + 3, _buf)
 
             if turn.assistant_content:
                 content_preview = turn.assistant_content.replace("\n", "\\n")
                 if len(content_preview) > 200:
                     content_preview = content_preview[:200] + "..."
-                print(f"{prefix}  │  💬 {content_preview}")
+                out(f"{prefix}  │  💬 {content_preview}")
 
-            print(f"{prefix}  └─")
+            out(f"{prefix}  └─")
 
         # Summary
         if self.depth == 0:
@@ -197,25 +359,28 @@ class EpisodeTrace:
             all_calls = self.total_tool_calls_recursive
             sub_turns = all_turns - root_turns
             sub_calls = all_calls - root_calls
-            print(f"{prefix}{'═' * 60}")
-            print(f"{prefix}📊 Episode Summary:")
-            print(f"{prefix}  Total duration:       {self.duration_s:.2f}s")
-            print(f"{prefix}  Sub-agents spawned:   {self.total_sub_agents_spawned}")
-            print(f"{prefix}")
-            print(f"{prefix}  Turns  (root agent):  {root_turns}")
-            print(f"{prefix}  Turns  (sub-agents):  {sub_turns}")
-            print(f"{prefix}  Turns  (total):       {all_turns}")
-            print(f"{prefix}")
-            print(f"{prefix}  Tool calls (root):    {root_calls}")
-            print(f"{prefix}  Tool calls (sub):     {sub_calls}")
-            print(f"{prefix}  Tool calls (total):   {all_calls}")
-            print(f"{prefix}")
-            print(f"{prefix}  Prompt tokens:        {self.total_prompt_tokens:,}")
-            print(f"{prefix}  Completion tokens:    {self.total_completion_tokens:,}")
-            print(f"{prefix}  Total tokens:         {self.total_tokens:,}")
-            print(f"{prefix}")
-            print(f"{prefix}  Final response:       {(self.final_response or '(none)')[:200]}{'...' if self.final_response and len(self.final_response) > 200 else ''}")
-            print(f"{prefix}{'═' * 60}")
+            out(f"{prefix}{'═' * 60}")
+            out(f"{prefix}📊 Episode Summary:")
+            out(f"{prefix}  Total duration:       {self.duration_s:.2f}s")
+            out(f"{prefix}  Sub-agents spawned:   {self.total_sub_agents_spawned}")
+            out(f"{prefix}")
+            out(f"{prefix}  Turns  (root agent):  {root_turns}")
+            out(f"{prefix}  Turns  (sub-agents):  {sub_turns}")
+            out(f"{prefix}  Turns  (total):       {all_turns}")
+            out(f"{prefix}")
+            out(f"{prefix}  Tool calls (root):    {root_calls}")
+            out(f"{prefix}  Tool calls (sub):     {sub_calls}")
+            out(f"{prefix}  Tool calls (total):   {all_calls}")
+            out(f"{prefix}")
+            out(f"{prefix}  Prompt tokens:        {self.total_prompt_tokens:,}")
+            out(f"{prefix}  Completion tokens:    {self.total_completion_tokens:,}")
+            out(f"{prefix}  Total tokens:         {self.total_tokens:,}")
+            out(f"{prefix}")
+            out(f"{prefix}  Final response:       {(self.final_response or '(none)')[:200]}{'...' if self.final_response and len(self.final_response) > 200 else ''}")
+            out(f"{prefix}{'═' * 60}")
+
+        if flush:
+            sys.stdout.write("\n".join(_buf) + "\n")
 
     def to_html(self) -> str:
         """Generate a self-contained HTML page visualizing this trace."""
@@ -1009,30 +1174,121 @@ document.addEventListener('DOMContentLoaded', function() {
 """
 
 
-def _esc(text: str) -> str:
-    """HTML-escape text."""
-    return html_mod.escape(str(text))
+@lru_cache(maxsize=4096)
+def _esc_cached(text: str) -> str:
+    return html_mod.escape(text)
+
+
+def _esc(text) -> str:
+    """HTML-escape text.
+
+    Short strings are memoized — tool names, agent labels, filenames and
+    badge text come from a tiny alphabet but get escaped thousands of
+    times per page.  Long strings (tool outputs, drafts) are escaped
+    directly so the cache never pins large blobs.
+    """
+    if not isinstance(text, str):
+        text = str(text)
+    if len(text) <= 256:
+        return _esc_cached(text)
+    return html_mod.escape(text)
+
+
+# Compiled once: these run per tool call while rendering.
+_DRAFT_SAVED_RE = re.compile(r"Draft v(\d+) saved \(([^)]+)\)")
+_MD_DATA_IMG_RE = re.compile(r"!\[.*?\]\(data:image[^)]*\)")
+
+_IMG_EXTS = ("png", "jpg", "jpeg", "gif", "svg", "pdf")
+_B64_HEADER_SUFFIX = " (base64) ---\n"
+
+
+def _iter_base64_sections(text: str):
+    """Yield (data_start, data_end, filename) for every
+    ``--- name (base64) ---`` section in *text*.
+
+    Linear single-pass scan shared by the display stripper and the image
+    extractor.  The lazy DOTALL regexes these replace rescanned the blob
+    for every candidate end position, making rendering quadratic on
+    outputs that embed megabyte-scale base64 payloads — and silently
+    missed back-to-back sections whose terminator doubled as the next
+    header's leading dashes.
+    """
+    pos = 0
+    n = len(text)
+    while True:
+        hdr = text.find("--- ", pos)
+        if hdr == -1:
+            return
+        hdr_end = text.find(_B64_HEADER_SUFFIX, hdr + 4)
+        if hdr_end == -1:
+            return
+        # The header must sit on a single line.
+        nl = text.find("\n", hdr + 4)
+        if nl != -1 and nl < hdr_end:
+            pos = nl + 1
+            continue
+        data_start = hdr_end + len(_B64_HEADER_SUFFIX)
+        data_end = text.find("\n---", data_start)
+        if data_end == -1:
+            # Unterminated section: runs to the end (bar a final newline,
+            # matching the old ``$`` anchor).
+            data_end = n - 1 if text.endswith("\n") else n
+        if data_end > data_start:
+            yield data_start, data_end, text[hdr + 4 : hdr_end]
+        if data_end >= n - 1:
+            return
+        pos = data_end + 1
+
+
+def _strip_base64(text: str) -> str:
+    """Replace base64 payloads with a short placeholder for display."""
+    if "(base64)" not in text:
+        return text
+    out = []
+    last = 0
+    for data_start, data_end, _filename in _iter_base64_sections(text):
+        out.append(text[last:data_start])
+        out.append("[base64 data omitted — see image below]")
+        last = data_end
+    if not out:
+        return text
+    out.append(text[last:])
+    return "".join(out)
 
 
 def _extract_images_from_output(output: str) -> list:
     """Pull base64 image data from FETCHED FILES sections."""
     imgs = []
-    for m in re.finditer(
-        r"--- (.+?\.(png|jpg|jpeg|gif|svg|pdf)) \(base64\) ---\n(.+?)(?:\n---|$)",
-        output, re.DOTALL
-    ):
-        imgs.append({"filename": m.group(1), "data": m.group(3).strip()})
+    if "(base64)" not in output:
+        return imgs
+    for data_start, data_end, filename in _iter_base64_sections(output):
+        if "." in filename and filename.rsplit(".", 1)[-1].lower() in _IMG_EXTS:
+            imgs.append({"filename": filename, "data": output[data_start:data_end].strip()})
     return imgs
 
 
+def _iter_tool_calls(trace_dict: dict):
+    """Yield the tool-call dicts of one trace level, in document order."""
+    for turn in trace_dict.get("turns", []):
+        yield from turn.get("tool_calls", [])
+
+
 def _collect_all_images(trace_dict: dict) -> list:
-    """Recursively collect all images from every tool call in a trace."""
+    """Collect all images from every tool call in a trace, in document order.
+
+    Iterative: a stack of suspended tool-call iterators replaces the
+    recursion, so deep sub-agent chains can't exhaust the Python stack.
+    """
     imgs = []
-    for turn in trace_dict.get("turns", []):
-        for tc in turn.get("tool_calls", []):
+    stack = [_iter_tool_calls(trace_dict)]
+    while stack:
+        for tc in stack[-1]:
             imgs.extend(_extract_images_from_output(tc.get("output", "")))
             if tc.get("child_trace"):
-                imgs.extend(_collect_all_images(tc["child_trace"]))
+                stack.append(_iter_tool_calls(tc["child_trace"]))
+                break  # descend; the parent iterator resumes afterwards
+        else:
+            stack.pop()
     return imgs
 
 
@@ -1051,28 +1307,44 @@ def _flatten_trace(trace_dict: dict, depth: int = 0, counter: list | None = None
     if counter is None:
         counter = [0, 0]  # [card_counter, sub_agent_counter]
     cards: list[dict] = []
-    turns = trace_dict.get("turns", [])
+
+    def _events(d: dict):
+        # One trace level as a flat event stream: its turns, with child
+        # traces interleaved right after the turn that spawned them.
+        for turn in d.get("turns", []):
+            yield "turn", turn
+            for tc in turn.get("tool_calls", []):
+                if tc.get("child_trace"):
+                    yield "child", tc["child_trace"]
+
     if depth == 0:
         agent_label = "Root"
     else:
         counter[1] += 1
         agent_label = f"Sub-Agent #{counter[1]}"
 
-    for turn in turns:
-        counter[0] += 1
-        card_id = f"card-{counter[0]}"
-        cards.append({
-            "type": "turn",
-            "id": card_id,
-            "depth": depth,
-            "turn": turn,
-            "turn_num": turn.get("turn_number", "?"),
-            "agent_label": agent_label,
-        })
-        # Inline sub-agent turns immediately after the parent turn
-        for tc in turn.get("tool_calls", []):
-            if tc.get("child_trace"):
-                cards.extend(_flatten_trace(tc["child_trace"], depth + 1, counter))
+    # Iterative depth-first walk over suspended event streams — same card
+    # order and numbering as the old recursion, without the call frames.
+    stack = [(depth, agent_label, _events(trace_dict))]
+    while stack:
+        node_depth, node_label, events = stack[-1]
+        for kind, payload in events:
+            if kind == "turn":
+                counter[0] += 1
+                cards.append({
+                    "type": "turn",
+                    "id": f"card-{counter[0]}",
+                    "depth": node_depth,
+                    "turn": payload,
+                    "turn_num": payload.get("turn_number", "?"),
+                    "agent_label": node_label,
+                })
+            else:
+                counter[1] += 1
+                stack.append((node_depth + 1, f"Sub-Agent #{counter[1]}", _events(payload)))
+                break  # descend; this level's events resume afterwards
+        else:
+            stack.pop()
 
     return cards
 
@@ -1676,14 +1948,10 @@ def _render_tool_block(tc: dict) -> str:
     toutput = tc.get("output", "")
     tc_dur = tc.get("duration_s", 0)
 
-    args_json = json.dumps(targs, indent=2, default=str)
+    args_json = fast_json_dumps(targs, indent=True, default=str)
 
     # Strip base64 blobs from display
-    display_output = re.sub(
-        r"(--- .+? \(base64\) ---\n).+?(\n---|$)",
-        r"\1[base64 data omitted — see image below]\2",
-        toutput, flags=re.DOTALL,
-    )
+    display_output = _strip_base64(toutput)
 
     parts = [f'<div class="tool-block">']
     parts.append(
@@ -1699,7 +1967,7 @@ def _render_tool_block(tc: dict) -> str:
     if tname == "refine_draft":
         draft_content = targs.get("content", "")
         # Parse version / char count from output: "✅ Draft v3 saved (1,639 chars)."
-        _ver_m = re.search(r"Draft v(\d+) saved \(([^)]+)\)", toutput)
+        _ver_m = _DRAFT_SAVED_RE.search(toutput)
         is_rejected = toutput.startswith("Draft too short")
 
         if _ver_m:
@@ -2209,9 +2477,20 @@ def _render_chain_panel(chain_plan: Optional[dict]) -> str:
 
 
 def render_trace_html(trace_dict: dict, title: str = "Dispatch Trace") -> str:
-    """Generate a self-contained HTML page from a trace dict (or loaded JSON).
+    """Generate a self-contained HTML page from a trace dict (or loaded JSON)."""
+    buf = io.StringIO()
+    _stream_trace_html(trace_dict, buf.write, title)
+    return buf.getvalue()
+
 
-    Uses the trace_viewer design: sidebar timeline + main content with turn cards.
+def _stream_trace_html(trace_dict: dict, write, title: str = "Dispatch Trace") -> None:
+    """Emit the trace page through *write* chunk by chunk.
+
+    Uses the trace_viewer design: sidebar timeline + main content with
+    turn cards.  Turn groups — the bulk of the page, including every
+    base64-stripped tool output — are written as they render, so peak
+    memory stays at one group's HTML instead of the whole document plus
+    its parts list.
     """
     d = trace_dict
     tid = _esc(d.get("trace_id", "?"))
@@ -2222,7 +2501,7 @@ def render_trace_html(trace_dict: dict, title: str = "Dispatch Trace") -> str:
     final_raw = d.get("final_response", "") or ""
 
     # Strip broken markdown image references
-    final_clean = re.sub(r'!\[.*?\]\(data:image[^)]*\)', '', final_raw).strip()
+    final_clean = _MD_DATA_IMG_RE.sub('', final_raw).strip()
     # For the <script type="text/template"> tag: escape only </script> sequences
     # so the browser doesn't prematurely close the tag.  The JS reads textContent
     # and feeds it to marked.parse(), so HTML entities must NOT be used here.
@@ -2272,16 +2551,6 @@ def render_trace_html(trace_dict: dict, title: str = "Dispatch Trace") -> str:
     # Build sidebar timeline (root-focused with sub-agent counts)
     timeline_html = _build_timeline(flat_cards, groups=groups)
 
-    # Build turn cards (grouped: root + collapsible sub-agents)
-    cards_parts = []
-    prev_chain_snapshot = None
-    for group in groups:
-        cards_parts.append(_render_turn_group(group, prev_chain_snapshot))
-        # Track chain snapshot for diff detection
-        root_snap = group["root"]["turn"].get("chain_snapshot")
-        if root_snap is not None:
-            prev_chain_snapshot = root_snap
-
     # Build chain analysis panel
     # Build rubric panel (only present when RUBRIC_ENABLED ran)
     rubric_xml = d.get("rubric") or ""
@@ -2299,7 +2568,7 @@ def render_trace_html(trace_dict: dict, title: str = "Dispatch Trace") -> str:
         for img in all_images
     )
 
-    return f"""<!DOCTYPE html>
+    write(f"""<!DOCTYPE html>
 <html lang="en">
 <head>
 <meta charset="utf-8"/>
@@ -2366,7 +2635,18 @@ def render_trace_html(trace_dict: dict, title: str = "Dispatch Trace") -> str:
     </div>
 
     <!-- Turn cards -->
-    {"".join(cards_parts)}
+    """)
+
+    # Stream turn cards as they render (grouped: root + collapsible
+    # sub-agents), tracking chain snapshots for diff detection.
+    prev_chain_snapshot = None
+    for group in groups:
+        write(_render_turn_group(group, prev_chain_snapshot))
+        root_snap = group["root"]["turn"].get("chain_snapshot")
+        if root_snap is not None:
+            prev_chain_snapshot = root_snap
+
+    write(f"""
 
     <!-- Final response -->
     <div class="final-card" id="final">
@@ -2383,7 +2663,7 @@ def render_trace_html(trace_dict: dict, title: str = "Dispatch Trace") -> str:
 
 <script>{_JS}</script>
 </body>
-</html>"""
+</html>""")
 
 
 def render_trace_file(json_path: str, output_path: str = None) -> str:
@@ -10,6 +10,8 @@ import requests
 import random
 import threading
 
+import httpx
+
 from dataclasses import dataclass
 from typing import Any, Dict, Tuple, Optional, List
 
@@ -57,6 +59,72 @@ SUPPORTED_LANGUAGES = [
 ]
 
 
+# -----------------------------
+# Fast JSON helpers
+# -----------------------------
+# orjson is several times faster than stdlib json in both directions.
+# It's optional: stdlib is the fallback so the package keeps working
+# without it.  orjson.JSONDecodeError subclasses json.JSONDecodeError,
+# so callers' except clauses work unchanged.
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def fast_json_loads(s):
+    """json.loads drop-in backed by orjson when available."""
+    if _orjson is not None:
+        return _orjson.loads(s)
+    return json.loads(s)
+
+
+def fast_json_dumps(obj, indent: bool = False, default=None) -> str:
+    """json.dumps drop-in backed by orjson when available.
+
+    ``indent`` maps to 2-space indentation (the only level orjson
+    supports), matching what the trace writer uses.
+    """
+    if _orjson is not None:
+        option = _orjson.OPT_INDENT_2 if indent else 0
+        return _orjson.dumps(obj, option=option, default=default).decode("utf-8")
+    return json.dumps(obj, indent=2 if indent else None, default=default)
+
+
+# -----------------------------
+# Pooled LLM HTTP client
+# -----------------------------
+# One process-wide client with keep-alive to the vLLM (or external
+# verifier) endpoint: avoids a TCP/TLS handshake per call, and bounds
+# total connections so the runner, handler nodes and sub-agents share
+# the pool instead of each opening their own sockets.  HTTP/2
+# multiplexing is used when the 'h2' package is installed; httpx needs
+# it for http2=True, so fall back to HTTP/1.1 keep-alive without it.
+# No read timeout — generations can legitimately take minutes.
+VLLM_TIMEOUT = httpx.Timeout(None, connect=10.0)
+VLLM_LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=8)
+try:
+    VLLM_CLIENT = httpx.Client(http2=True, timeout=VLLM_TIMEOUT, limits=VLLM_LIMITS)
+except ImportError:
+    VLLM_CLIENT = httpx.Client(timeout=VLLM_TIMEOUT, limits=VLLM_LIMITS)
+
+# Transport-level failures worth a retry; HTTP-level errors (4xx/5xx
+# bodies) keep flowing to each caller's own error handling.
+RETRYABLE_HTTP_ERRORS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.ReadError,
+    httpx.WriteError,
+    httpx.RemoteProtocolError,
+    httpx.PoolTimeout,
+)
+
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter for transport-level retries."""
+    return INITIAL_RETRY_DELAY * (2 ** attempt) + random.uniform(0, 0.5)
+
+
 # -----------------------------
 # Tool calling helpers
 # -----------------------------
@@ -79,15 +147,19 @@ def execute_tool_call(tool_name: str, tool_args: Dict[str, Any]) -> str:
 
 
 
+# Compiled once — the DOTALL scan runs on every fallback-parsed turn and
+# pattern recompilation would otherwise repeat per call.
+_TOOL_CALL_RE = re.compile(r"<tool_call>\s*(\{.*?\})\s*</tool_call>", re.DOTALL)
+
+
 def extract_tool_calls(text: str) -> List[Dict[str, Any]]:
     """
     Extract <tool_call>{...}</tool_call> blocks and parse JSON inside.
     Supports multiple tool calls in one model turn.
     """
     tool_calls: List[Dict[str, Any]] = []
-    pattern = r"<tool_call>\s*(\{.*?\})\s*</tool_call>"
 
-    for m in re.finditer(pattern, text, flags=re.DOTALL):
+    for m in _TOOL_CALL_RE.finditer(text):
         blob = m.group(1).strip()
         try:
             tool_calls.append(json.loads(blob))
@@ -121,6 +193,25 @@ class TTLCache:
                 return None
             return ent.value
 
+    def get_with_staleness(self, key: str, stale_window: float = 0.0) -> Tuple[Optional[str], bool]:
+        """Like get(), but returns (value, fresh).
+
+        Entries expired by no more than ``stale_window`` seconds come
+        back with fresh=False so callers can serve stale while they
+        revalidate in the background.
+        """
+        now = time.time()
+        with self._lock:
+            ent = self._data.get(key)
+            if not ent:
+                return None, False
+            if ent.expires_at >= now:
+                return ent.value, True
+            if ent.expires_at + stale_window >= now:
+                return ent.value, False
+            self._data.pop(key, None)
+            return None, False
+
     def set(self, key: str, value: str):
         now = time.time()
         with self._lock:
@@ -129,6 +220,10 @@ class TTLCache:
                 self._data.pop(next(iter(self._data)), None)
             self._data[key] = CacheEntry(value=value, expires_at=now + self.ttl)
 
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
 # --- global rate limiter (token bucket-ish) ---
 class RateLimiter:
     def __init__(self, min_interval_s: float = 1.0):